@@ -1,139 +1,245 @@
 import re
-import tkinter as tk
-from tkinter import scrolledtext
-import sympy as sp
-from sympy import symbols, Eq, solve, simplify, sympify
-from sympy.parsing.sympy_parser import parse_expr
+import os
+import sys
+import json
+import time
+import cmath
+import random
+PROCESS_START = time.perf_counter()
+import argparse
 import threading
+import multiprocessing
+import queue
+from collections import OrderedDict, deque
 
-class LinearEquationCalculator:
-    def __init__(self):
-        self.variables = set()
-        self.setup_gui()
-        
-    def setup_gui(self):
-        """Setup the terminal-like GUI window"""
-        self.root = tk.Tk()
-        self.root.title("Linear Equation Calculator")
-        self.root.geometry("900x600")
-        self.root.configure(bg='black')
-        
-        # Make it look like cmd/terminal
-        self.root.resizable(True, True)
-        
-        # Create main frame
-        main_frame = tk.Frame(self.root, bg='black')
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Create output area (like terminal screen)
-        self.output_area = scrolledtext.ScrolledText(
-            main_frame,
-            bg='black',
-            fg='yellow',
-            font=('Consolas', 11),
-            insertbackground='white',
-            selectbackground='#404040',
-            selectforeground='white',
-            wrap=tk.WORD,
-            state=tk.DISABLED,
-            height=30
-        )
-        self.output_area.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
-        
-        # Create input frame
-        input_frame = tk.Frame(main_frame, bg='black')
-        input_frame.pack(fill=tk.X)
-        
-        # Command prompt label
-        prompt_label = tk.Label(
-            input_frame,
-            text=">>> ",
-            bg='black',
-            fg='lime',
-            font=('Consolas', 11, 'bold')
-        )
-        prompt_label.pack(side=tk.LEFT)
-        
-        # Input field
-        self.input_field = tk.Entry(
-            input_frame,
-            bg='black',
-            fg='white',
-            font=('Consolas', 11),
-            insertbackground='white',
-            selectbackground='#404040',
-            selectforeground='white',
-            bd=0,
-            highlightthickness=1,
-            highlightcolor='lime',
-            highlightbackground='gray'
-        )
-        self.input_field.pack(fill=tk.X, expand=True, padx=(5, 0))
-        
-        # Bind enter key to process command
-        self.input_field.bind('<Return>', self.process_command)
-        
-        # Focus on input field
-        self.input_field.focus_set()
+# sympy and NumPy take seconds to import, so they are loaded by load_math_modules()
+# (in the worker processes) instead of here, letting the window appear right away
+sp = None
+np = None
+math_modules_lock = threading.Lock()
+# tkinter is only needed for the window, so it is loaded by load_gui_modules() when one is opened;
+# --batch and benchmark.py run without Tk installed
+tk = None
+scrolledtext = None
+
+def load_gui_modules():
+    """Import tkinter into the module globals"""
+    global tk, scrolledtext
+    import tkinter
+    from tkinter import scrolledtext as scrolled_text
+    tk = tkinter
+    scrolledtext = scrolled_text
+
+def load_math_modules():
+    """Import sympy (and NumPy, if installed) into the module globals
+    
+    Returns the seconds spent importing; 0 if they were already loaded.
+    """
+    global sp, np, symbols, Eq, solve, simplify, sympify, linear_eq_to_matrix, linsolve, lambdify
+    global parse_expr, NonlinearError
+    with math_modules_lock:
+        if sp is not None:
+            return 0.0
+        start = time.perf_counter()
+        from sympy import symbols, Eq, solve, simplify, sympify, linear_eq_to_matrix, linsolve, lambdify
+        from sympy.parsing.sympy_parser import parse_expr
+        from sympy.solvers.solveset import NonlinearError
+        try:
+            import numpy
+        except ImportError:  # only evaluate() and nsolve() need NumPy
+            numpy = None
+        import sympy
+        np = numpy
+        sp = sympy
+        return time.perf_counter() - start
+
+# Seconds a command may run before its worker process is killed
+COMMAND_TIMEOUT = 30
+# Commands allowed to wait for a free worker
+MAX_QUEUED_COMMANDS = 8
+# Random points verify() evaluates both sides at before trying simplify
+PROBE_POINTS = 3
+# Largest value grid evaluate() will compute
+MAX_GRID_POINTS = 10_000_000
+# Numeric solving: Newton's method stops once its steps are below NUMERIC_TOLERANCE (relative), and
+# roots closer together than ROOT_MERGE_TOLERANCE are reported once
+NUMERIC_TOLERANCE = 1e-10
+ROOT_MERGE_TOLERANCE = 1e-6
+NEWTON_ITERATIONS = 60
+# Starting points nsolve() spreads over its search range, and the range used when none is given
+NSOLVE_STARTS = 400
+NSOLVE_RANGE = (-10.0, 10.0)
+# equation() leaves polynomials up to this degree to solve(); past it there is no general formula in
+# radicals, so unless sympy spots a closed form quickly the roots are found numerically instead
+SYMBOLIC_MAX_DEGREE = 4
+# How often the output area is refreshed, and how many lines it keeps
+OUTPUT_FRAME_MS = 33
+MAX_SCROLLBACK_LINES = 5000
+
+# Command grammar, compiled once: name(argument)
+COMMAND_RE = re.compile(r'^([A-Za-z_]\w*)\((.*)\)$')
+TIMEOUT_RE = re.compile(r'^timeout\((\d+(?:\.\d+)?)\)$')
+# Single-pass tokenizer for arguments: identifiers and equals signs
+TOKEN_RE = re.compile(r'[a-zA-Z][a-zA-Z0-9]*|=')
+# Function names and mathematical constants that don't count as variables
+NON_VARIABLES = frozenset({'sin', 'cos', 'tan', 'log', 'ln', 'exp', 'sqrt', 'pi', 'e'})
+
+class LRUCache:
+    """Bounded least-recently-used mapping with hit/miss counters"""
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
         
-        # Display welcome message
-        self.display_welcome()
+    def get(self, key):
+        """Return (True, value) on a hit and (False, None) on a miss"""
+        with self.lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+                self.hits += 1
+                return True, self.data[key]
+            self.misses += 1
+            return False, None
+    
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+    
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self.lock:
+            self.data.clear()
+            self.hits = 0
+            self.misses = 0
+
+class ExpressionCache:
+    """Memoizes the parse, simplify and solve stages of the sympy pipeline"""
+    TIERS = ('parse', 'simplify', 'solve', 'compile')
+    
+    def __init__(self, maxsize=256):
+        self.tiers = {name: LRUCache(maxsize) for name in self.TIERS}
         
-    def display_welcome(self):
-        """Display welcome message"""
-        welcome_msg = """╔══════════════════════════════════════════════════════════════════════╗
-║                    🧮 MATH TERMINAL 🧮                                ║
-║                        Standalone Terminal Version                   ║
-╚══════════════════════════════════════════════════════════════════════╝
+    @staticmethod
+    def normalize(expr_str):
+        """Normalize an input string so equivalent spellings share a cache key"""
+        expr_str = expr_str.replace('^', '**')
+        # Drop whitespace around operators, then collapse whatever is left
+        expr_str = re.sub(r'\s*([-+*/=(),])\s*', r'\1', expr_str)
+        return re.sub(r'\s+', ' ', expr_str).strip()
+    
+    def lookup(self, tier, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        cache = self.tiers[tier]
+        found, value = cache.get(key)
+        if not found:
+            value = compute()
+            cache.put(key, value)
+        return value
+    
+    def clear(self):
+        """Clear every tier"""
+        for cache in self.tiers.values():
+            cache.clear()
+    
+    def stats(self):
+        """Return {tier: (entries, hits, misses)}"""
+        return {name: (len(cache.data), cache.hits, cache.misses) for name, cache in self.tiers.items()}
 
-💡 Available Commands:
-   • equation("your_equation")  - Solve equations
-   • verify("your_equation")    - Check if equation is true
-   • simplify("expression")     - Simplify expressions
-   • expression("expression")   - Analyze expressions
-   • guide()                    - Show detailed tutorial
+class NumericRoots(list):
+    """Roots found numerically, in the list shape solve() returns for one variable
+    
+    method says how they were found; multiplicities (polynomials only)
+    parallels the values. span (low, high) means only the real roots in
+    that range were looked for.
+    """
+    def __init__(self, roots, method, multiplicities=None, span=None):
+        super().__init__(roots)
+        self.method = method
+        self.multiplicities = multiplicities
+        self.span = span
+    
+    @property
+    def complete(self):
+        """True if these are all the roots (every polynomial root, not a range search)"""
+        return self.multiplicities is not None and self.span is None
+    
+    def within(self, span):
+        """Just the real roots between span's ends, as a NumericRoots for that range"""
+        low, high = min(span), max(span)
+        slack = NUMERIC_TOLERANCE * max(1.0, abs(low), abs(high))
+        kept = [i for i, root in enumerate(self) if root.is_real and low - slack <= root <= high + slack]
+        return NumericRoots([self[i] for i in kept], f"{self.method}, real roots between {low:g} and {high:g}",
+                            [self.multiplicities[i] for i in kept] if self.multiplicities else None, (low, high))
 
-🚀 Quick Start: Try typing → equation("x + 5 = 10")
-📚 Need help? Type → guide()
+def merge_roots(roots, tolerance=ROOT_MERGE_TOLERANCE):
+    """Collapse (value, multiplicity) pairs closer than tolerance into one, adding up multiplicities
+    
+    Real roots come first in ascending order, then complex ones by real part.
+    """
+    merged = []
+    for value, count in sorted(roots, key=lambda root: (root[0].imag != 0, root[0].real, root[0].imag)):
+        for i, (kept, kept_count) in enumerate(merged):
+            if abs(value - kept) <= tolerance * max(1.0, abs(kept)):
+                merged[i] = (kept, kept_count + count)
+                break
+        else:
+            merged.append((value, count))
+    return merged
 
-Ready to calculate! 🎯
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def numeric_value(value):
+    """Turn a complex root into a sympy number showing the digits it is accurate to
+    
+    Parts within NUMERIC_TOLERANCE of a whole number become that integer.
+    """
+    def part(x):
+        if abs(x - round(x)) <= NUMERIC_TOLERANCE * max(1.0, abs(x)):
+            return sp.Integer(round(x))
+        return sp.Float(x, 12)
+    return part(value.real) + part(value.imag) * sp.I
 
-"""
-        self.print_output(welcome_msg)
+class MathEngine:
+    """GUI-free command engine: parses commands and does all of the math
     
-    def print_output(self, text, color='white'):
-        """Print text to output area"""
-        self.output_area.config(state=tk.NORMAL)
-        
-        # Add timestamp-like prompt for commands
-        if text.strip() and not text.startswith(('╔', '║', '╚', '💡', '🚀', '📚', 'Ready', '━')):
-            if text.startswith('\n'):
-                text = text[1:]  # Remove leading newline
-            
-        self.output_area.insert(tk.END, text + '\n')
-        self.output_area.see(tk.END)
-        self.output_area.config(state=tk.DISABLED)
-        
-        # Update the GUI
-        self.root.update_idletasks()
+    Output goes through print_output(), which collects lines in
+    self.output; front ends override it to display them.
+    """
+    # name -> (handler, argument kind), filled in by register_command()
+    commands = {}
     
-    def process_command(self, event=None):
-        """Process user command"""
-        command = self.input_field.get().strip()
-        if not command:
-            return
-            
-        # Display the command with prompt
-        self.print_output(f">>> {command}", 'lime')
-        
-        # Clear input field
-        self.input_field.delete(0, tk.END)
+    def __init__(self, load_modules=True):
+        self.variables = set()
+        self.cache = ExpressionCache()
+        self.output = []
+        self.last_scan = (None, None)
+        self.verify_stages = []
+        self.import_seconds = load_math_modules() if load_modules else 0.0
+    
+    @classmethod
+    def register_command(cls, name, handler, argument='quoted'):
+        """Add a command to the grammar
         
-        # Process command in separate thread to avoid GUI freezing
-        thread = threading.Thread(target=self.execute_command, args=(command,))
-        thread.daemon = True
-        thread.start()
+        handler is the name of an engine method, or a function called as
+        handler(engine, text) (just handler(engine) for name()). argument says what goes between the
+        parentheses: 'quoted' for name("text"), 'raw' for any non-empty
+        text, 'none' for name(). Register commands at import time so the
+        worker processes know them too.
+        """
+        cls.commands[name] = (handler, argument)
+    
+    def print_output(self, text, color='white'):
+        """Collect a line of output"""
+        self.output.append((text, color))
+    
+    def take_output(self):
+        """Return the collected output lines and start a new batch"""
+        output, self.output = self.output, []
+        return output
     
     def execute_command(self, command):
         """Execute the command"""
@@ -187,6 +293,33 @@ Just type one of the 5 commands below, EXACTLY as shown!
    Type: guide()
    💡 Shows this tutorial whenever you're confused
 
+🧩 BONUS: SOLVE SEVERAL EQUATIONS AT ONCE
+──────────────────────────────────────────────────────────────────────
+   Type: system("first_equation; second_equation")
+   What it does: Finds values that make every equation true
+   📝 Example: system("x + y = 3; x - y = 1")
+   💡 This will tell you x = 2, y = 1
+
+📊 BONUS: CALCULATE OVER MANY VALUES
+──────────────────────────────────────────────────────────────────────
+   Type: evaluate("expression", x=start..end, y=[value, value])
+   What it does: Calculates every combination and sums up the results
+   📝 Example: evaluate("x**2 + 3*y", x=0..1000, y=[1,2,3])
+   💡 Add a step with x=0..1:0.01, or save rows with csv="results.csv"
+
+⚡ BONUS: SOLVE HARD EQUATIONS WITH NUMBERS
+──────────────────────────────────────────────────────────────────────
+   Type: nsolve("equation", x=start..end)
+   What it does: Finds decimal answers when exact ones are too slow or impossible
+   📝 Example: nsolve("sin(x) = x/2", x=-10..10)
+   💡 Polynomials get every root; other equations get the real roots in the range
+
+⏱️ BONUS: STOP A SLOW COMMAND
+──────────────────────────────────────────────────────────────────────
+   Type: cancel()
+   What it does: Stops whatever is still running or waiting
+   💡 Commands stop by themselves after 30 seconds; timeout(60) allows 60
+
 📋 IMPORTANT RULES (Please read!):
 ──────────────────────────────────────────────────────────────────────
 ✓ ALWAYS put your math inside double quotes: "like this"
@@ -231,21 +364,34 @@ verify("2 + 2 = 4")
 """
         self.print_output(guide_text)
     
+    def scan_input(self, input_str):
+        """Tokenize input once, returning (equals sign count, set of variable names)
+        
+        The result for the most recent string is kept, so validating the
+        argument parse_command() already scanned costs nothing.
+        """
+        if self.last_scan[0] == input_str:
+            return self.last_scan[1]
+        equals_count = 0
+        variables = set()
+        for token in TOKEN_RE.findall(input_str):
+            if token == '=':
+                equals_count += 1
+            elif token not in NON_VARIABLES:
+                variables.add(token)
+        self.last_scan = (input_str, (equals_count, variables))
+        return equals_count, variables
+    
     def validate_input(self, input_str):
         """Validate the input string for rules compliance"""
+        equals_count, variables = self.scan_input(input_str)
+        
         # Check for equals signs
-        equals_count = input_str.count('=')
         if equals_count > 1:
             self.print_output("❌ Error: Only 1 equals sign (=) allowed per equation")
             return False
             
-        # Extract variables
-        variables = re.findall(r'[a-zA-Z][a-zA-Z0-9]*', input_str)
-        # Filter out function names and mathematical constants
-        excluded = {'sin', 'cos', 'tan', 'log', 'ln', 'exp', 'sqrt', 'pi', 'e'}
-        variables = [var for var in variables if var not in excluded]
-        
-        if len(set(variables)) > 5:
+        if len(variables) > 5:
             self.print_output("❌ Error: Maximum 5 variables allowed")
             return False
             
@@ -255,13 +401,240 @@ verify("2 + 2 = 4")
         """Parse string expression into sympy expression"""
         try:
             # Replace common mathematical notations
-            expr_str = expr_str.replace('^', '**')
-            expr = parse_expr(expr_str)
+            expr_str = self.cache.normalize(expr_str)
+            expr = self.cache.lookup('parse', expr_str, lambda: parse_expr(expr_str))
             return expr
         except Exception as e:
             self.print_output(f"❌ Error parsing expression: {e}")
             return None
     
+    def cached_simplify(self, expr):
+        """simplify() memoized on the parsed expression"""
+        return self.cache.lookup('simplify', expr, lambda: simplify(expr))
+    
+    def cached_solve(self, equation, variables):
+        """solve() memoized on the equation(s) and the variables solved for"""
+        equations = tuple(equation) if isinstance(equation, (list, tuple)) else (equation,)
+        key = (equations, tuple(variables))
+        return self.cache.lookup('solve', key, lambda: self.solve_fast(equations, variables))
+    
+    def solve_fast(self, equations, variables):
+        """Solve linear input by matrix elimination, falling back to solve() otherwise
+        
+        Returns a list of solutions in the shape solve() uses for a single
+        equation: plain values for one variable, tuples ordered like
+        `variables` otherwise.
+        """
+        exprs = []
+        for equation in equations:
+            if equation == sp.true:
+                continue
+            if equation == sp.false:
+                return []
+            exprs.append(equation.lhs - equation.rhs if isinstance(equation, Eq) else equation)
+        if not exprs:
+            return []
+            
+        try:
+            matrix, rhs = linear_eq_to_matrix(exprs, variables)
+        except NonlinearError:
+            # Not linear in the variables. One-variable polynomials without a closed form go straight
+            # to the numeric solver; everything else tries the general solver first.
+            univariate = len(exprs) == 1 and len(variables) == 1 and np is not None
+            if univariate and self.needs_numeric(exprs[0], variables[0]):
+                return self.polynomial_roots(exprs[0], variables[0])
+            try:
+                solutions = solve(list(equations) if len(equations) > 1 else equations[0], variables)
+            except NotImplementedError:
+                # No closed form (e.g. sin(x) = x/2) - look for real roots numerically instead, as long
+                # as NumPy can evaluate the equation and its derivative
+                if not univariate or not self.can_lambdify(exprs[0], variables[0]):
+                    raise
+                return self.newton_roots(exprs[0], variables[0], np.linspace(*NSOLVE_RANGE, NSOLVE_STARTS),
+                                         NSOLVE_RANGE)
+            if isinstance(solutions, dict):
+                solutions = [solutions]
+            return solutions
+            
+        # Exact (rational) Gaussian elimination; parametric solutions keep free variables
+        solutions = list(linsolve((matrix, rhs), variables))
+        if len(variables) == 1:
+            return [sol[0] for sol in solutions]
+        return solutions
+    
+    def needs_numeric(self, expr, var):
+        """True for a polynomial past SYMBOLIC_MAX_DEGREE whose roots sympy can't write in closed form
+        
+        solve() would answer with CRootOf placeholders for those, which
+        take far longer to evaluate than finding the roots numerically.
+        """
+        try:
+            poly = sp.Poly(expr, var)
+        except sp.PolynomialError:
+            return False
+        if poly.degree() <= SYMBOLIC_MAX_DEGREE or not all(coeff.is_number for coeff in poly.all_coeffs()):
+            return False
+        return sum(sp.roots(poly).values()) < poly.degree()
+    
+    def polynomial_roots(self, expr, var):
+        """Every root of expr = 0 if expr is a non-constant polynomial in var, else None
+        
+        Repeated factors of exact polynomials are split off first
+        (square-free factorization), so each remaining root is simple; the
+        roots of each factor are the eigenvalues of its companion matrix
+        (np.roots), sharpened with a few Newton steps.
+        """
+        try:
+            poly = sp.Poly(expr, var)
+        except sp.PolynomialError:
+            return None
+        coeffs = poly.all_coeffs()
+        if poly.degree() < 1 or not all(coeff.is_number for coeff in coeffs):
+            return None
+        factors = poly.sqf_list()[1] if poly.domain.is_Exact else [(poly, 1)]
+        
+        roots = []
+        for factor, multiplicity in factors:
+            coeffs = np.array([complex(coeff) for coeff in factor.all_coeffs()])
+            if not coeffs.imag.any():
+                coeffs = coeffs.real
+            derivative = np.polyder(coeffs)
+            for root in np.roots(coeffs):
+                for _ in range(3):
+                    slope = np.polyval(derivative, root)
+                    if slope == 0:
+                        break
+                    root -= np.polyval(coeffs, root) / slope
+                root = complex(root)
+                if abs(root.imag) <= NUMERIC_TOLERANCE * max(1.0, abs(root)):
+                    root = complex(root.real, 0.0)
+                roots.append((root, multiplicity))
+                
+        merged = merge_roots(roots)
+        return NumericRoots([numeric_value(root) for root, _ in merged],
+                            f"companion matrix eigenvalues, degree {poly.degree()}",
+                            [count for _, count in merged])
+    
+    def can_lambdify(self, expr, var):
+        """True if expr and its derivative in var compile to NumPy functions, as newton_roots() needs"""
+        try:
+            self.cached_lambdify(expr, [var])
+            self.cached_lambdify(sp.diff(expr, var), [var])
+        except Exception:
+            return False
+        return True
+    
+    def newton_roots(self, expr, var, starts, span=None):
+        """Real roots of expr = 0 reached by Newton's method from every point in starts
+        
+        All the starting points iterate together as one NumPy array. Repeated
+        roots, which plain Newton only pins down to about 1e-8, are finished
+        off by sympy's nsolve (modified Newton in 30-digit precision). Roots
+        found outside span (low, high), if given, are dropped.
+        """
+        f = self.cached_lambdify(expr, [var])
+        slope = self.cached_lambdify(sp.diff(expr, var), [var])
+        
+        def values(func, x):
+            return np.broadcast_to(np.asarray(func(x), dtype=float), x.shape)
+            
+        x = np.array(starts, dtype=float)
+        with np.errstate(all='ignore'):
+            typical_slope = np.nanmedian(np.abs(values(slope, x)))
+            for _ in range(NEWTON_ITERATIONS):
+                step = values(f, x) / values(slope, x)
+                x = x - step
+                scale = np.maximum(1.0, np.abs(x))
+                converged = np.abs(step) <= NUMERIC_TOLERANCE * scale
+                if np.all(converged | ~np.isfinite(x)):
+                    break
+            # Near a repeated root f is flat, so Newton creeps towards it and stalls on rounding noise
+            found = np.isfinite(x) & (np.abs(step) <= ROOT_MERGE_TOLERANCE * scale)
+            flat = np.abs(values(slope, x)) <= np.sqrt(NUMERIC_TOLERANCE) * typical_slope
+            repeated = found & (flat | ~converged)
+        if span is not None:
+            low, high = min(span), max(span)
+            slack = NUMERIC_TOLERANCE * max(1.0, abs(low), abs(high))
+            found &= (x >= low - slack) & (x <= high + slack)
+            
+        roots = [(complex(value), 1) for value in x[found & ~repeated]]
+        for value, _ in merge_roots([(complex(value), 1) for value in x[found & repeated]]):
+            try:
+                polished = complex(sp.nsolve(expr, var, value.real, solver='mnewton', prec=30, verify=False))
+                if abs(polished - value) <= ROOT_MERGE_TOLERANCE * max(1.0, abs(value)):
+                    value = complex(polished.real, 0.0)
+            except (ValueError, ZeroDivisionError, TypeError):
+                pass  # keep Newton's estimate
+            roots.append((value, 1))
+            
+        method = f"Newton's method from {len(starts)} starting points"
+        if span is not None:
+            span = (min(span), max(span))
+            method += f" between {span[0]:g} and {span[1]:g}"
+        return NumericRoots([numeric_value(root) for root, _ in merge_roots(roots)], method, span=span)
+    
+    def numeric_solve(self, expr, var, span=None, starts=None):
+        """Roots of expr = 0: all of them for polynomials, real ones by multi-start Newton otherwise
+        
+        A span (low, high) limits polynomial roots to the real ones in it.
+        Without explicit starts, NSOLVE_STARTS points are spread evenly over
+        span (NSOLVE_RANGE if none is given).
+        """
+        key = ('numeric', expr, var, span, tuple(starts) if starts is not None else None)
+        
+        def compute():
+            roots = self.polynomial_roots(expr, var)
+            if roots is not None:
+                return roots.within(span) if span is not None else roots
+            if starts is not None:
+                return self.newton_roots(expr, var, starts)
+            search = span or NSOLVE_RANGE
+            return self.newton_roots(expr, var, np.linspace(search[0], search[1], NSOLVE_STARTS), search)
+        return self.cache.lookup('solve', key, compute)
+    
+    def print_numeric_roots(self, var, roots):
+        """Display roots found numerically, with how they were found and how accurate they are
+        
+        Only a complete set of roots is called the solutions; a range or
+        starting-point search says other roots may exist.
+        """
+        self.print_output(f"⚡ Solved numerically ({roots.method})")
+        self.print_output(f"📏 Accurate to about {NUMERIC_TOLERANCE:g}; roots closer than {ROOT_MERGE_TOLERANCE:g} are shown once")
+        if roots.complete:
+            found, missing = "🎯 Solutions:", "❌ No solution found."
+        elif roots.span is not None:
+            where = f"between {roots.span[0]:g} and {roots.span[1]:g}"
+            found = f"🎯 Real roots found {where} (others may exist outside this range):"
+            missing = f"❌ No real roots found {where}"
+        else:
+            found = "🎯 Real roots found from the given starting points (others may exist):"
+            missing = "❌ No real roots found from the given starting points"
+        if not roots:
+            self.print_output(missing)
+            return
+        self.print_output(found)
+        for i, root in enumerate(roots):
+            count = roots.multiplicities[i] if roots.multiplicities else 1
+            repeated = f"  (repeated {count} times)" if count > 1 else ''
+            self.print_output(f"   📍 {var} = {root}{repeated}")
+    
+    def show_cache(self):
+        """Display cache statistics"""
+        self.print_cache_stats(self.cache.stats())
+    
+    def print_cache_stats(self, stats):
+        """Display {tier: (entries, hits, misses)} statistics"""
+        self.print_output("🗃️  Cache statistics:")
+        for tier, (entries, hits, misses) in stats.items():
+            lookups = hits + misses
+            rate = (100.0 * hits / lookups) if lookups else 0.0
+            self.print_output(f"   📍 {tier:<9} {entries:>4} entries, {hits} hits, {misses} misses ({rate:.0f}% hit rate)")
+    
+    def clear_cache(self):
+        """Empty the cache"""
+        self.cache.clear()
+        self.print_output("🧹 Cache cleared.")
+    
     def expression(self, expr_str):
         """Evaluate mathematical expressions"""
         self.print_output(f"🧮 Evaluating expression: {expr_str}")
@@ -286,6 +659,132 @@ verify("2 + 2 = 4")
             self.print_output(f"🔤 Variables found: {[str(var) for var in variables]}")
             self.print_output("ℹ️  This expression contains variables and cannot be evaluated to a single number.")
             self.print_output("💭 Use simplify() to simplify the expression or equation() to solve for variables.")
+            self.print_output('📊 Use evaluate("expression", x=0..10) to calculate it over a range of values.')
+    
+    def split_arguments(self, args_str):
+        """Split a comma separated argument list, ignoring commas inside brackets or quotes"""
+        parts, depth, quoted, current = [], 0, False, ''
+        for char in args_str:
+            if char == '"':
+                quoted = not quoted
+            elif not quoted and char in '[(':
+                depth += 1
+            elif not quoted and char in '])':
+                depth -= 1
+            elif char == ',' and depth == 0 and not quoted:
+                parts.append(current.strip())
+                current = ''
+                continue
+            current += char
+        parts.append(current.strip())
+        return parts
+    
+    def parse_values(self, spec):
+        """Turn a value spec into a 1-D array
+        
+        Accepts a single number, a list like [1, 2, 3], an inclusive range
+        like 0..1000 (step 1) or an inclusive range with a step like 0..1:0.01.
+        """
+        spec = spec.strip()
+        if spec.startswith('[') and spec.endswith(']'):
+            return np.array([float(sympify(item)) for item in spec[1:-1].split(',') if item.strip()])
+        if '..' in spec:
+            start_str, stop_str = spec.split('..', 1)
+            stop_str, _, step_str = stop_str.partition(':')
+            start, stop = float(sympify(start_str)), float(sympify(stop_str))
+            step = float(sympify(step_str)) if step_str else 1.0
+            if step <= 0:
+                raise ValueError(f"step must be positive in '{spec}'")
+            count = int(np.floor((stop - start) / step + 1e-9)) + 1
+            if count < 1:
+                raise ValueError(f"empty range '{spec}'")
+            return start + step * np.arange(count)
+        return np.array([float(sympify(spec))])
+    
+    def cached_lambdify(self, expr, variables):
+        """Compile expr once into a NumPy function of variables"""
+        key = (expr, tuple(variables))
+        return self.cache.lookup('compile', key, lambda: lambdify(variables, expr, modules='numpy'))
+    
+    def evaluate(self, args_str):
+        """Evaluate an expression over a grid of variable values in one vectorized call"""
+        args = self.split_arguments(args_str)
+        match = re.match(r'^"(.+)"$', args[0])
+        if not match:
+            self.print_output('❌ Error: Usage is evaluate("expression", x=0..10, y=[1,2,3])')
+            return
+        expr_str = match.group(1)
+        self.print_output(f"📊 Evaluating over a grid: {expr_str}")
+        
+        if np is None:
+            self.print_output("❌ Error: evaluate() needs NumPy - install it with: pip install numpy")
+            return
+        if not self.validate_input(expr_str):
+            return
+            
+        expr = self.parse_expression(expr_str)
+        if expr is None:
+            return
+            
+        try:
+            # Keyword arguments: one value spec per variable, plus an optional csv="file"
+            grid, csv_path = {}, None
+            for arg in args[1:]:
+                name, sep, spec = arg.partition('=')
+                name = name.strip()
+                if not sep or not name:
+                    self.print_output(f"❌ Error: Expected name=values, got '{arg}'")
+                    return
+                if name == 'csv':
+                    csv_path = spec.strip().strip('"')
+                else:
+                    grid[name] = self.parse_values(spec)
+                    
+            variables = sorted(expr.free_symbols, key=str)
+            missing = [str(var) for var in variables if str(var) not in grid]
+            if missing:
+                self.print_output(f"❌ Error: No values given for {', '.join(missing)}")
+                return
+                
+            shape = tuple(len(grid[str(var)]) for var in variables)
+            points = int(np.prod(shape))
+            if points > MAX_GRID_POINTS:
+                self.print_output(f"❌ Error: Grid has {points:,} points - the limit is {MAX_GRID_POINTS:,}")
+                return
+                
+            # Give every variable its own axis so broadcasting builds the grid without copying
+            axes = []
+            for i, var in enumerate(variables):
+                axis_shape = [1] * len(variables)
+                axis_shape[i] = -1
+                axes.append(grid[str(var)].reshape(axis_shape))
+                
+            func = self.cached_lambdify(expr, variables)
+            start = time.perf_counter()
+            with np.errstate(all='ignore'):
+                values = np.broadcast_to(np.asarray(func(*axes), dtype=float), shape)
+            elapsed = time.perf_counter() - start
+            
+            if variables:
+                sizes = ' × '.join(f"{var} ({len(grid[str(var)])} values)" for var in variables)
+                self.print_output(f"🔤 Grid: {sizes} = {points:,} points")
+            finite = values[np.isfinite(values)]
+            if finite.size:
+                self.print_output(f"💡 min = {finite.min():.6g}, max = {finite.max():.6g}")
+                self.print_output(f"💡 mean = {finite.mean():.6g}, std = {finite.std():.6g}")
+            if finite.size < values.size:
+                self.print_output(f"⚠️ {values.size - finite.size:,} points are undefined (inf/nan)")
+            self.print_output(f"⚡ Computed in {elapsed * 1000:.2f} ms")
+            
+            if csv_path:
+                columns = [column.ravel() for column in np.meshgrid(*(grid[str(var)] for var in variables), indexing='ij')]
+                columns.append(values.ravel())
+                header = ','.join([str(var) for var in variables] + ['value'])
+                np.savetxt(csv_path, np.column_stack(columns), delimiter=',', header=header, comments='', fmt='%.10g')
+                self.print_output(f"💾 Saved {points:,} rows to {csv_path}")
+                
+        except Exception as e:
+            self.print_output(f"❌ Error evaluating expression: {e}")
     
     def verify(self, equation_str):
         """Verify if an equation is true"""
@@ -319,19 +818,21 @@ verify("2 + 2 = 4")
                     self.print_output(f"   Right side: {float(right_expr)}")
             else:
                 # Check if the equation is an identity (always true) or contradiction (always false)
-                equation = Eq(left_expr, right_expr)
-                
-                # Try to solve the equation
-                solutions = solve(equation, all_vars)
+                verdict, solutions = self.classify_equation(left_expr, right_expr, all_vars)
                 
-                # Simplify both sides to see if they're identical
-                simplified_diff = simplify(left_expr - right_expr)
-                
-                if simplified_diff == 0:
+                if verdict == 'identity':
                     # The equation is always true (identity)
                     self.print_output("✅ The equation is TRUE for all values")
                     self.print_output("💡 This is an identity - both sides are mathematically equivalent")
-                elif not solutions:
+                elif isinstance(solutions, NumericRoots):
+                    # Found numerically: say how, and how accurate the values are. Only every root of a
+                    # polynomial is a complete answer; a Newton search may miss roots outside its range.
+                    if solutions.complete:
+                        self.print_output(f"✅ The equation is TRUE only for these values of {all_vars[0]}:")
+                    elif solutions:
+                        self.print_output(f"✅ The equation is TRUE for these values of {all_vars[0]}:")
+                    self.print_numeric_roots(all_vars[0], solutions)
+                elif verdict == 'contradiction' or not solutions:
                     # No solutions exist - contradiction
                     self.print_output("❌ The equation is FALSE for all values")
                     self.print_output("💡 This equation has no solution - it's a contradiction")
@@ -359,10 +860,65 @@ verify("2 + 2 = 4")
                                     self.print_output(f"   📍 {', '.join(vals)}")
                     else:
                         self.print_output("❓ Cannot verify equation - use equation() to solve for the variables.")
+                        
+                stages = ' → '.join(f"{stage} {seconds * 1000:.2f} ms" for stage, seconds in self.verify_stages)
+                self.print_output(f"⏱️ Checked with: {stages}")
                 
         except Exception as e:
             self.print_output(f"❌ Error verifying equation: {e}")
     
+    def classify_equation(self, left_expr, right_expr, variables):
+        """Decide whether left = right is an identity, a contradiction or needs solving
+        
+        Cheap checks run first and the expensive ones only when those are
+        inconclusive: structural equality, expand-based cancellation,
+        numeric probing, simplify, and finally solve. Returns
+        (verdict, solutions) where verdict is 'identity', 'contradiction'
+        or 'solved'; each stage's (name, seconds) is left in
+        self.verify_stages.
+        """
+        self.verify_stages = []
+        
+        def timed(stage, compute):
+            start = time.perf_counter()
+            result = compute()
+            self.verify_stages.append((stage, time.perf_counter() - start))
+            return result
+            
+        if timed('structural', lambda: left_expr == right_expr):
+            return 'identity', None
+            
+        # Polynomial-style cancellation; a non-zero constant left over means no solution exists
+        diff = timed('expand', lambda: sp.expand(left_expr - right_expr))
+        if diff == 0:
+            return 'identity', None
+        if not diff.free_symbols and diff.is_zero is False and diff.is_finite:
+            return 'contradiction', []
+            
+        # Numbers can only prove the sides differ; if every probe agrees, simplify has to decide
+        if not timed('probe', lambda: self.probe_difference(left_expr, right_expr, variables)):
+            if timed('simplify', lambda: self.cached_simplify(diff)) == 0:
+                return 'identity', None
+                
+        solutions = timed('solve', lambda: self.cached_solve(Eq(left_expr, right_expr), variables))
+        return 'solved', solutions
+    
+    def probe_difference(self, left_expr, right_expr, variables):
+        """True if both sides evaluate to clearly different numbers at some probe point"""
+        rng = random.Random(0)
+        for _ in range(PROBE_POINTS):
+            point = {var: rng.uniform(-3, 3) for var in variables}
+            try:
+                left = complex(left_expr.evalf(subs=point))
+                right = complex(right_expr.evalf(subs=point))
+            except (TypeError, ValueError):
+                continue  # undefined or non-numeric here - try the next point
+            if not (cmath.isfinite(left) and cmath.isfinite(right)):
+                continue
+            if abs(left - right) > 1e-9 * max(1.0, abs(left), abs(right)):
+                return True
+        return False
+    
     def simplify_expr(self, expr_str):
         """Simplify mathematical expressions"""
         self.print_output(f"🔧 Simplifying: {expr_str}")
@@ -379,8 +935,8 @@ verify("2 + 2 = 4")
             if left_expr is None or right_expr is None:
                 return
                 
-            simplified_left = simplify(left_expr)
-            simplified_right = simplify(right_expr)
+            simplified_left = self.cached_simplify(left_expr)
+            simplified_right = self.cached_simplify(right_expr)
             
             self.print_output(f"✨ Simplified equation: {simplified_left} = {simplified_right}")
         else:
@@ -389,7 +945,7 @@ verify("2 + 2 = 4")
             if expr is None:
                 return
                 
-            simplified = simplify(expr)
+            simplified = self.cached_simplify(expr)
             self.print_output(f"✨ Simplified expression: {simplified}")
     
     def solve_equation(self, equation_str):
@@ -424,9 +980,11 @@ verify("2 + 2 = 4")
             self.print_output(f"🔤 Variables: {[str(var) for var in variables]}")
             
             # Solve equation
-            solutions = solve(equation, variables)
+            solutions = self.cached_solve(equation, variables)
             
-            if not solutions:
+            if isinstance(solutions, NumericRoots):
+                self.print_numeric_roots(variables[0], solutions)
+            elif not solutions:
                 self.print_output("❌ No solution found.")
             elif len(variables) == 1:
                 self.print_output(f"🎯 Solution: {variables[0]} = {solutions[0]}")
@@ -443,27 +1001,158 @@ verify("2 + 2 = 4")
         except Exception as e:
             self.print_output(f"❌ Error solving equation: {e}")
     
+    def solve_system(self, system_str):
+        """Solve several equations, separated by semicolons, simultaneously"""
+        self.print_output(f"🧩 Solving system: {system_str}")
+        
+        equation_strs = [part.strip() for part in system_str.split(';') if part.strip()]
+        if not equation_strs:
+            self.print_output("❌ Error: No equations given")
+            return
+            
+        # Every equation must follow the usual rules
+        for equation_str in equation_strs:
+            if not self.validate_input(equation_str):
+                return
+            if '=' not in equation_str:
+                self.print_output(f"❌ Error: '{equation_str}' must contain an equals sign (=)")
+                return
+            
+        try:
+            equations = []
+            for equation_str in equation_strs:
+                left_str, right_str = equation_str.split('=', 1)
+                left_expr = self.parse_expression(left_str.strip())
+                right_expr = self.parse_expression(right_str.strip())
+                
+                if left_expr is None or right_expr is None:
+                    return
+                    
+                equations.append(Eq(left_expr, right_expr))
+                
+            variables = sorted(set().union(*(eq.free_symbols for eq in equations)), key=str)
+            
+            # The variable limit applies to the system as a whole
+            if len(variables) > 5:
+                self.print_output("❌ Error: Maximum 5 variables allowed")
+                return
+            if not variables:
+                self.print_output("❓ No variables to solve for.")
+                return
+                
+            self.print_output(f"🔤 Variables: {[str(var) for var in variables]}")
+            
+            solutions = self.cached_solve(equations, variables)
+            
+            if not solutions:
+                self.print_output("❌ No solution found - the equations are inconsistent.")
+                return
+                
+            self.print_output("🎯 Solutions:")
+            for sol in solutions:
+                if isinstance(sol, dict):
+                    vals = [f"{var} = {val}" for var, val in sol.items()]
+                elif len(variables) == 1:
+                    vals = [f"{variables[0]} = {sol}"]
+                else:
+                    vals = [f"{var} = {val}" for var, val in zip(variables, sol) if var != val]
+                self.print_output(f"   📍 {', '.join(vals) or 'any values'}")
+                
+        except Exception as e:
+            self.print_output(f"❌ Error solving system: {e}")
+    
+    def nsolve(self, args_str):
+        """Solve a one-variable equation numerically, optionally searching a given range"""
+        args = self.split_arguments(args_str)
+        match = re.match(r'^"(.+)"$', args[0])
+        if not match:
+            self.print_output('❌ Error: Usage is nsolve("equation", x=-10..10)')
+            return
+        equation_str = match.group(1)
+        self.print_output(f"⚡ Solving numerically: {equation_str}")
+        
+        if np is None:
+            self.print_output("❌ Error: nsolve() needs NumPy - install it with: pip install numpy")
+            return
+        if not self.validate_input(equation_str):
+            return
+        if '=' not in equation_str:
+            self.print_output("❌ Error: Must be an equation with an equals sign (=)")
+            return
+            
+        try:
+            left_str, right_str = equation_str.split('=', 1)
+            left_expr = self.parse_expression(left_str.strip())
+            right_expr = self.parse_expression(right_str.strip())
+            
+            if left_expr is None or right_expr is None:
+                return
+                
+            expr = left_expr - right_expr
+            variables = sorted(expr.free_symbols, key=str)
+            if not variables:
+                self.print_output("❓ No variables to solve for.")
+                return
+            if len(variables) > 1:
+                self.print_output("❌ Error: nsolve() works on equations in one variable - use system() for more")
+                return
+            var = variables[0]
+            if sp.expand(expr) == 0:
+                self.print_output(f"✅ Every value of {var} is a solution")
+                return
+            if not self.can_lambdify(expr, var):
+                self.print_output("❌ Error: This equation or its derivative can't be computed numerically")
+                self.print_output('💡 Try equation() instead.')
+                return
+                
+            # x=low..high searches that range; a number or [list] gives the starting points themselves
+            span, starts = None, None
+            for arg in args[1:]:
+                name, sep, spec = arg.partition('=')
+                if not sep or name.strip() != str(var):
+                    self.print_output(f"❌ Error: Expected {var}=start..end, got '{arg}'")
+                    return
+                if '..' in spec and ':' not in spec:
+                    low_str, high_str = spec.split('..', 1)
+                    span = (float(sympify(low_str)), float(sympify(high_str)))
+                else:
+                    starts = self.parse_values(spec)
+                    
+            start = time.perf_counter()
+            roots = self.numeric_solve(expr, var, span, starts)
+            elapsed = time.perf_counter() - start
+            
+            self.print_numeric_roots(var, roots)
+            self.print_output(f"⚡ Computed in {elapsed * 1000:.2f} ms")
+            
+        except Exception as e:
+            self.print_output(f"❌ Error solving equation: {e}")
+    
     def parse_command(self, command):
         """Parse and execute user command"""
         command = command.strip()
         
-        # Check for guide()
-        if command == "guide()":
-            self.guide()
-            return True
-            
-        # Parse function calls with parameters
-        patterns = [
-            (r'^expression\("(.+)"\)$', self.expression),
-            (r'^verify\("(.+)"\)$', self.verify),
-            (r'^simplify\("(.+)"\)$', self.simplify_expr),
-            (r'^equation\("(.+)"\)$', self.solve_equation)
-        ]
-        
-        for pattern, func in patterns:
-            match = re.match(pattern, command)
-            if match:
-                func(match.group(1))
+        # One match splits name and argument; the name is then a dict lookup
+        match = COMMAND_RE.match(command)
+        entry = self.commands.get(match.group(1)) if match else None
+        if entry:
+            handler, argument = entry
+            text = match.group(2)
+            if argument == 'quoted':
+                valid = len(text) > 2 and text[0] == text[-1] == '"'
+                text = text[1:-1]
+            elif argument == 'raw':
+                valid = bool(text)
+            else:
+                valid = not text
+                
+            if valid:
+                self.scan_input(text)
+                args = (text,) if argument != 'none' else ()
+                if isinstance(handler, str):
+                    getattr(self, handler)(*args)
+                else:
+                    handler(self, *args)
                 return True
         
         # Invalid command
@@ -473,14 +1162,541 @@ verify("2 + 2 = 4")
         self.guide()
         return True
     
+for name, handler, argument in [
+    ('guide', 'guide', 'none'),
+    ('cache', 'show_cache', 'none'),
+    ('clear_cache', 'clear_cache', 'none'),
+    ('expression', 'expression', 'quoted'),
+    ('verify', 'verify', 'quoted'),
+    ('simplify', 'simplify_expr', 'quoted'),
+    ('equation', 'solve_equation', 'quoted'),
+    ('system', 'solve_system', 'quoted'),
+    ('evaluate', 'evaluate', 'raw'),
+    ('nsolve', 'nsolve', 'raw'),
+]:
+    MathEngine.register_command(name, handler, argument)
+
+def worker_main(conn, warm_start=True):
+    """Worker process loop: run requests sent by the GUI until the pipe closes"""
+    engine = MathEngine()
+    warm_seconds = 0.0
+    if warm_start:
+        # Run a couple of throwaway commands so sympy's own lazy setup is done before the first real one
+        start = time.perf_counter()
+        engine.execute_command('equation("2*x + 1 = 5")')
+        engine.execute_command('simplify("x + x")')
+        engine.take_output()
+        engine.cache.clear()
+        warm_seconds = time.perf_counter() - start
+    conn.send(('ready', engine.import_seconds, warm_seconds))
+    
+    while True:
+        try:
+            kind, payload = conn.recv()
+        except (EOFError, OSError):
+            break
+            
+        if kind == 'command':
+            engine.execute_command(payload)
+            conn.send(engine.take_output())
+        elif kind == 'cache_stats':
+            conn.send(engine.cache.stats())
+        elif kind == 'clear_cache':
+            engine.cache.clear()
+            conn.send(None)
+
+def batch_init():
+    """Give this process the engine used by batch_run()"""
+    global batch_engine
+    batch_engine = MathEngine()
+
+def batch_run(item):
+    """Run one (line number, command) pair and return its JSON record"""
+    line_no, command = item
+    start = time.perf_counter()
+    batch_engine.execute_command(command)
+    elapsed = time.perf_counter() - start
+    return {
+        'line': line_no,
+        'command': command,
+        'output': [text for text, color in batch_engine.take_output()],
+        'seconds': round(elapsed, 6),
+    }
+
+def run_batch(lines, jobs=1, out=sys.stdout):
+    """Run commands without a window, streaming one JSON line per command to out
+    
+    Blank lines and lines starting with # are skipped. With jobs > 1 the
+    commands are spread over that many processes; records still come out
+    in input order.
+    """
+    items = ((line_no, line.strip()) for line_no, line in enumerate(lines, 1)
+             if line.strip() and not line.lstrip().startswith('#'))
+    if jobs > 1:
+        with multiprocessing.get_context('spawn').Pool(jobs, initializer=batch_init) as pool:
+            records = pool.imap(batch_run, items, chunksize=8)
+            for record in records:
+                out.write(json.dumps(record) + '\n')
+                out.flush()
+    else:
+        batch_init()
+        for item in items:
+            out.write(json.dumps(batch_run(item)) + '\n')
+            out.flush()
+
+class Job:
+    """A request waiting for, or running on, a worker process"""
+    def __init__(self, kind, payload, callback):
+        self.kind = kind
+        self.payload = payload
+        self.callback = callback  # called as callback(status, result)
+        self.cancelled = False
+
+class SympyWorker:
+    """One worker process plus the thread that feeds it jobs"""
+    def __init__(self, pool):
+        self.pool = pool
+        self.pending = deque()  # jobs addressed to this worker only (broadcasts)
+        self.current = None
+        self.ready = False
+        self.start_process()
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+        
+    def start_process(self):
+        """Spawn a fresh worker process"""
+        self.conn, child_conn = self.pool.context.Pipe()
+        self.process = self.pool.context.Process(target=worker_main, args=(child_conn, self.pool.warm_start),
+                                                 daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+    
+    def wait_ready(self):
+        """Block until the process has loaded sympy; False if it died first"""
+        try:
+            _, import_seconds, warm_seconds = self.conn.recv()
+        except (EOFError, OSError):
+            return False
+        self.ready = True
+        self.pool.worker_ready(import_seconds, warm_seconds)
+        return True
+    
+    def restart(self):
+        """Kill the worker process (if it is still running) and spawn a new one"""
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.conn.close()
+        self.start_process()
+    
+    def run_job(self, job):
+        """Send one job to the process and wait for its reply"""
+        try:
+            self.conn.send((job.kind, job.payload))
+            if not self.conn.poll(self.pool.timeout):
+                return 'timeout', None
+            return 'ok', self.conn.recv()
+        except (EOFError, OSError):
+            # The process died - either cancel() killed it or it crashed
+            return 'crashed', None
+    
+    def serve(self):
+        """Worker thread loop"""
+        while True:
+            # Jobs stay queued in the pool until this process has finished importing sympy
+            if not self.ready and not self.wait_ready():
+                if self.pool.closed:
+                    return
+                time.sleep(1)
+                self.restart()
+                continue
+                
+            job = self.pool.next_job(self)
+            if job is None:
+                return
+                
+            status, result = self.run_job(job)
+            with self.pool.cond:
+                self.current = None
+                cancelled = job.cancelled
+            if cancelled or status != 'ok':
+                self.restart()
+            if cancelled:
+                status = 'cancelled'
+            job.callback(status, result)
+
+class SympyWorkerPool:
+    """Small persistent pool of processes that run sympy work off the GUI process
+    
+    Each command gets `timeout` seconds before its worker is killed and
+    replaced, and at most `max_queued` commands may wait for a free worker.
+    With warm_start, each process runs a few throwaway commands after
+    importing sympy so the first real command doesn't pay for sympy's
+    lazy setup. on_ready(import_seconds, warm_seconds) is called the
+    first time a worker becomes ready.
+    """
+    def __init__(self, size=2, timeout=COMMAND_TIMEOUT, max_queued=MAX_QUEUED_COMMANDS,
+                 warm_start=True, on_ready=None):
+        self.context = multiprocessing.get_context('spawn')
+        self.timeout = timeout
+        self.max_queued = max_queued
+        self.warm_start = warm_start
+        self.on_ready = on_ready
+        self.startup = None  # (import_seconds, warm_seconds, ready_at) of the first ready worker
+        self.jobs = deque()
+        self.cond = threading.Condition()
+        self.closed = False
+        self.workers = [SympyWorker(self) for _ in range(size)]
+        
+    def worker_ready(self, import_seconds, warm_seconds):
+        """Record that a worker process has finished loading"""
+        with self.cond:
+            first = self.startup is None
+            if first:
+                self.startup = (import_seconds, warm_seconds, time.perf_counter() - PROCESS_START)
+        if first and self.on_ready:
+            self.on_ready(import_seconds, warm_seconds)
+    
+    def next_job(self, worker):
+        """Block until there is a job for worker; None once the pool is shut down"""
+        with self.cond:
+            while not (worker.pending or self.jobs or self.closed):
+                self.cond.wait()
+            if self.closed:
+                return None
+            job = worker.pending.popleft() if worker.pending else self.jobs.popleft()
+            worker.current = job
+            return job
+    
+    def submit(self, command, callback):
+        """Queue a command; returns False if the queue is full"""
+        with self.cond:
+            if len(self.jobs) >= self.max_queued:
+                return False
+            self.jobs.append(Job('command', command, callback))
+            self.cond.notify_all()
+            return True
+    
+    def broadcast(self, kind, callback):
+        """Send a request to every worker; callback gets the list of replies"""
+        replies = []
+        lock = threading.Lock()
+        
+        def collect(status, result):
+            with lock:
+                replies.append(result if status == 'ok' else None)
+                done = len(replies) == len(self.workers)
+            if done:
+                callback(replies)
+                
+        with self.cond:
+            for worker in self.workers:
+                worker.pending.append(Job(kind, None, collect))
+            self.cond.notify_all()
+    
+    def cancel(self):
+        """Drop queued commands and kill running ones; returns (queued, running) counts"""
+        with self.cond:
+            queued = len(self.jobs)
+            self.jobs.clear()
+            running = 0
+            for worker in self.workers:
+                if worker.current is not None and worker.current.kind == 'command':
+                    worker.current.cancelled = True
+                    worker.process.terminate()
+                    running += 1
+        return queued, running
+    
+    def shutdown(self):
+        """Stop every worker"""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        for worker in self.workers:
+            worker.process.terminate()
+
+class LinearEquationCalculator(MathEngine):
+    def __init__(self, workers=2, timeout=COMMAND_TIMEOUT, max_queued=MAX_QUEUED_COMMANDS, warm_start=True):
+        # The GUI process never does math itself, so it skips importing sympy
+        super().__init__(load_modules=False)
+        load_gui_modules()
+        self.timings = {}
+        self.output_queue = queue.Queue()
+        self.pool = SympyWorkerPool(workers, timeout, max_queued, warm_start, on_ready=self.engine_ready)
+        self.local_commands = {
+            'guide()': self.guide,
+            'cache()': self.show_cache,
+            'clear_cache()': self.clear_cache,
+            'cancel()': self.cancel,
+            'startup()': self.show_startup,
+        }
+        self.setup_gui()
+        self.timings['window'] = time.perf_counter() - PROCESS_START
+        
+
+    def setup_gui(self):
+        """Setup the terminal-like GUI window"""
+        self.root = tk.Tk()
+        self.root.title("Linear Equation Calculator")
+        self.root.geometry("900x600")
+        self.root.configure(bg='black')
+        
+        # Make it look like cmd/terminal
+        self.root.resizable(True, True)
+        
+        # Create main frame
+        main_frame = tk.Frame(self.root, bg='black')
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Create output area (like terminal screen)
+        self.output_area = scrolledtext.ScrolledText(
+            main_frame,
+            bg='black',
+            fg='yellow',
+            font=('Consolas', 11),
+            insertbackground='white',
+            selectbackground='#404040',
+            selectforeground='white',
+            wrap=tk.WORD,
+            state=tk.DISABLED,
+            height=30
+        )
+        self.output_area.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        
+        # Create input frame
+        input_frame = tk.Frame(main_frame, bg='black')
+        input_frame.pack(fill=tk.X)
+        
+        # Command prompt label
+        prompt_label = tk.Label(
+            input_frame,
+            text=">>> ",
+            bg='black',
+            fg='lime',
+            font=('Consolas', 11, 'bold')
+        )
+        prompt_label.pack(side=tk.LEFT)
+        
+        # Input field
+        self.input_field = tk.Entry(
+            input_frame,
+            bg='black',
+            fg='white',
+            font=('Consolas', 11),
+            insertbackground='white',
+            selectbackground='#404040',
+            selectforeground='white',
+            bd=0,
+            highlightthickness=1,
+            highlightcolor='lime',
+            highlightbackground='gray'
+        )
+        self.input_field.pack(fill=tk.X, expand=True, padx=(5, 0))
+        
+        # Bind enter key to process command
+        self.input_field.bind('<Return>', self.process_command)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        
+        # Start drawing queued output
+        self.root.after(0, self.flush_output)
+        
+        # Focus on input field
+        self.input_field.focus_set()
+        
+        # Display welcome message
+        self.display_welcome()
+        
+    def display_welcome(self):
+        """Display welcome message"""
+        welcome_msg = """╔══════════════════════════════════════════════════════════════════════╗
+║                    🧮 MATH TERMINAL 🧮                                ║
+║                        Standalone Terminal Version                   ║
+╚══════════════════════════════════════════════════════════════════════╝
+
+💡 Available Commands:
+   • equation("your_equation")  - Solve equations
+   • verify("your_equation")    - Check if equation is true
+   • simplify("expression")     - Simplify expressions
+   • system("eq1; eq2; ...")    - Solve several equations together
+   • expression("expression")   - Analyze expressions
+   • evaluate("expr", x=0..10)  - Calculate over a range of values
+   • nsolve("equation", x=a..b) - Find roots numerically
+   • guide()                    - Show detailed tutorial
+   • cache() / clear_cache()    - Show or reset the result cache
+   • cancel()                   - Stop running and queued commands
+   • startup()                  - Show how long startup took
+
+🚀 Quick Start: Try typing → equation("x + 5 = 10")
+📚 Need help? Type → guide()
+
+Ready to calculate! 🎯
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+"""
+        self.print_output(welcome_msg)
+    
+    def print_output(self, text, color='white'):
+        """Queue text for the output area (safe to call from any thread)"""
+        # Add timestamp-like prompt for commands
+        if text.strip() and not text.startswith(('╔', '║', '╚', '💡', '🚀', '📚', 'Ready', '━')):
+            if text.startswith('\n'):
+                text = text[1:]  # Remove leading newline
+                
+        self.output_queue.put(text + '\n')
+    
+    def flush_output(self):
+        """Draw everything queued since the last frame in one insert (runs on the Tk mainloop)"""
+        chunks = []
+        try:
+            while True:
+                chunks.append(self.output_queue.get_nowait())
+        except queue.Empty:
+            pass
+            
+        if chunks:
+            self.output_area.config(state=tk.NORMAL)
+            self.output_area.insert(tk.END, ''.join(chunks))
+            
+            # Trim the oldest lines so long sessions don't grow without bound
+            lines = int(self.output_area.index('end-1c').split('.')[0])
+            if lines > MAX_SCROLLBACK_LINES:
+                self.output_area.delete('1.0', f'{lines - MAX_SCROLLBACK_LINES + 1}.0')
+                
+            self.output_area.see(tk.END)
+            self.output_area.config(state=tk.DISABLED)
+            
+            if 'first_prompt' not in self.timings:
+                self.timings['first_prompt'] = time.perf_counter() - PROCESS_START
+                
+        self.root.after(OUTPUT_FRAME_MS, self.flush_output)
+    
+    def process_command(self, event=None):
+        """Process user command"""
+        command = self.input_field.get().strip()
+        if not command:
+            return
+            
+        # Display the command with prompt
+        self.print_output(f">>> {command}", 'lime')
+        
+        # Clear input field
+        self.input_field.delete(0, tk.END)
+        
+        # Cheap commands that don't need sympy run right here
+        if command in self.local_commands:
+            self.local_commands[command]()
+            return
+        match = TIMEOUT_RE.match(command)
+        if match:
+            self.set_timeout(float(match.group(1)))
+            return
+            
+        # Everything else runs in a worker process so a slow command can't freeze the GUI
+        if not self.pool.submit(command, self.show_result):
+            self.print_output(f"⚠️ {self.pool.max_queued} commands are already waiting - try again shortly or type cancel()")
+        elif self.pool.startup is None:
+            self.print_output("⏳ The math engine is still loading - your command will run as soon as it's ready.")
+    
+    def engine_ready(self, import_seconds, warm_seconds):
+        """Announce that the first worker process can take commands"""
+        self.print_output(f"⚡ Math engine loaded in {time.perf_counter() - PROCESS_START:.2f}s")
+    
+    def show_startup(self):
+        """Display how long each part of startup took"""
+        self.print_output("⏱️ Startup timing (seconds since launch):")
+        self.print_output(f"   📍 Window created:        {self.timings.get('window', 0):.3f}s")
+        if 'first_prompt' in self.timings:
+            self.print_output(f"   📍 First prompt shown:    {self.timings['first_prompt']:.3f}s")
+        if self.pool.startup is None:
+            self.print_output("   📍 Math engine:           still loading...")
+            return
+        import_seconds, warm_seconds, ready_at = self.pool.startup
+        self.print_output(f"   📍 sympy import (worker): {import_seconds:.3f}s")
+        if self.pool.warm_start:
+            self.print_output(f"   📍 Warm-up (worker):      {warm_seconds:.3f}s")
+        self.print_output(f"   📍 Math engine ready:     {ready_at:.3f}s")
+    
+    def show_result(self, status, output):
+        """Display the outcome of a command run by the worker pool"""
+        if status == 'ok':
+            for text, color in output:
+                self.print_output(text, color)
+        elif status == 'timeout':
+            self.print_output(f"⏱️ Command took longer than {self.pool.timeout:g}s and was stopped.")
+            self.print_output("💡 Use timeout(seconds) to allow more time.")
+        elif status == 'crashed':
+            self.print_output("❌ The worker process stopped unexpectedly - please try again.")
+    
+    def cancel(self):
+        """Cancel running and queued commands"""
+        queued, running = self.pool.cancel()
+        if not queued and not running:
+            self.print_output("ℹ️  Nothing to cancel.")
+        else:
+            self.print_output(f"🛑 Cancelled {running} running and {queued} queued command(s).")
+    
+    def set_timeout(self, seconds):
+        """Change how long a command may run"""
+        if seconds <= 0:
+            self.print_output("❌ Error: Timeout must be greater than 0")
+            return
+        self.pool.timeout = seconds
+        self.print_output(f"⏱️ Commands now time out after {seconds:g}s.")
+    
+    def show_cache(self):
+        """Display cache statistics summed over every worker"""
+        self.pool.broadcast('cache_stats', self.show_worker_cache_stats)
+    
+    def show_worker_cache_stats(self, replies):
+        """Sum the cache statistics reported by each worker"""
+        totals = {tier: (0, 0, 0) for tier in ExpressionCache.TIERS}
+        for stats in replies:
+            for tier, counts in (stats or {}).items():
+                totals[tier] = tuple(a + b for a, b in zip(totals[tier], counts))
+        self.print_cache_stats(totals)
+    
+    def clear_cache(self):
+        """Empty the cache of every worker"""
+        self.pool.broadcast('clear_cache', lambda replies: self.print_output("🧹 Cache cleared."))
+    
+    def close(self):
+        """Stop the workers and close the window"""
+        self.pool.shutdown()
+        self.root.destroy()
+    
     def run(self):
         """Start the calculator"""
         try:
             self.root.mainloop()
         except KeyboardInterrupt:
             pass
+        finally:
+            self.pool.shutdown()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Math Terminal")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="run the commands in FILE ('-' for stdin) without a window and print JSON lines")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="processes to use with --batch (0 = one per CPU core)")
+    parser.add_argument('--no-warm-start', action='store_true',
+                        help="don't run warm-up commands when the math engine starts")
+    args = parser.parse_args(argv)
+    
+    if args.batch:
+        jobs = args.jobs or os.cpu_count() or 1
+        if args.batch == '-':
+            run_batch(sys.stdin, jobs)
+        else:
+            with open(args.batch, encoding='utf-8') as f:
+                run_batch(f, jobs)
+        return
+        
+    calculator = LinearEquationCalculator(warm_start=not args.no_warm_start)
+    calculator.run()
 
 # Run the calculator
 if __name__ == "__main__":
-    calculator = LinearEquationCalculator()
-    calculator.run()
\ No newline at end of file
+    multiprocessing.freeze_support()
+    main()
\ No newline at end of file
@@ -1,18 +1,26 @@
 import pygame
-import random
 import os
+import re
 import sys
-pygame.init()
-pygame.mixer.init()
+import argparse
+from collections import OrderedDict
+from snake_replay import Replay, replay_file_name, prune_replays
+from snake_autopilot import Autopilot
+from score_store import HighScoreStore
+from frame_profiler import FrameProfiler, phases
+from assets import AssetManager
+from snake_sim import SnakeSim, NONE, UP, DOWN, LEFT, RIGHT, screen_width, screen_height, snake_size, init_velocity
 white = (255, 255, 255)
 red = (255, 0, 0)
 cyan = (0, 255, 255)
 pink = (230, 204, 220)
 green = (0, 255, 0)
-screen_width = 900
-screen_height = 600
-window = pygame.display.set_mode((screen_width, screen_height))
-pygame.display.set_caption("Snakes")
+key_actions = {pygame.K_UP: UP, pygame.K_DOWN: DOWN, pygame.K_LEFT: LEFT, pygame.K_RIGHT: RIGHT}
+text_cache = OrderedDict()  # (text, color, font) -> rendered surface, least recently used first
+text_cache_size = 64
+show_profiler = False  # F3 toggles the frame-time overlay
+autopilot = False  # --autopilot: the bot plays every game
+profiler_surface = None
 
 def resource_path(relative_path):
     try:
@@ -20,137 +28,303 @@ def resource_path(relative_path):
     except Exception:
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
+def data_path(relative_path):
+    # Files the game writes: next to the exe when frozen (resource_path is a temp dir there), else next to Snakes.py
+    if getattr(sys, "frozen", False):
+        base_path = os.path.dirname(sys.executable)
+    else:
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, relative_path)
 
-bg_img = pygame.image.load(resource_path("Snake.png"))
-bg_img = pygame.transform.scale(bg_img, (screen_width, screen_height)).convert_alpha()
-pygame.display.update()
-clock = pygame.time.Clock()
-font = pygame.font.SysFont(None, 50)
+def setup(player_name="Player", keep_frames=False):
+    global window, bg_img, clock, font, overlay_font, scores, player, profiler, assets, effects
+    player = player_name
+    profiler = FrameProfiler(keep_history=keep_frames)
+    scores = HighScoreStore(data_path("High Score.txt"), data_path("Leaderboard.json"), resource_path("High Score.txt"))
+    pygame.init()
+    pygame.mixer.init()
+    pygame.mixer.set_reserved(1)
+    effects = pygame.mixer.Channel(0)  # kept for sound effects, so they never cut each other off
+    window = pygame.display.set_mode((screen_width, screen_height))
+    pygame.display.set_caption("Snakes")
+    assets = AssetManager(resource_path)
+    assets.preload_sounds(["Game Over.mp3"])
+    bg_img = assets.image("Snake.png", (screen_width, screen_height))
+    pygame.display.update()
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont(None, 50)
+    overlay_font = pygame.font.SysFont(None, 22)
+def render_text(text, color, text_font=None):
+    text_font = text_font or font
+    key = (text, color, text_font)
+    surface = text_cache.get(key)
+    if surface is None:
+        surface = text_font.render(text, True, color)
+        text_cache[key] = surface
+        if len(text_cache) > text_cache_size:
+            text_cache.popitem(last=False)
+    else:
+        text_cache.move_to_end(key)
+    return surface
+def layout_text(text, color, x, y):
+    # Returns [(surface, rect)] for text: digits come from cached single-glyph surfaces (a digit
+    # atlas) and the other runs from the text cache, so a changing number never rasterizes anything
+    parts = []
+    for run in re.findall(r"\d|\D+", text):
+        surface = render_text(run, color)
+        parts.append((surface, surface.get_rect(topleft=(x, y))))
+        x += surface.get_width()
+    return parts
 def screen_text(text, color, x, y):
-    screen_text = font.render(text, True, color)
-    window.blit(screen_text, [x, y])
+    window.blit(render_text(text, color), [x, y])
+def draw_profiler():
+    # Frame-time overlay in the top-right corner; the stats are re-rendered a few times a second
+    global profiler_surface
+    if (profiler_surface is None) or (profiler.frame % 15 == 0):
+        stats = profiler.summary()
+        lines = [f"FPS {stats.get('fps', 0):.0f}",
+                 f"frame p50/p95/p99 {stats.get('p50_ms', 0):.1f}/{stats.get('p95_ms', 0):.1f}/{stats.get('p99_ms', 0):.1f} ms"]
+        lines += [f"{phase}: {stats.get(phase + '_ms', 0):.2f} ms" for phase in phases]
+        line_height = overlay_font.get_linesize()
+        profiler_surface = pygame.Surface((230, line_height * len(lines) + 10)).convert()
+        for i, line in enumerate(lines):
+            profiler_surface.blit(overlay_font.render(line, True, white), (5, 5 + i * line_height))
+    rect = profiler_surface.get_rect(topright=(screen_width - 5, 5))
+    window.blit(profiler_surface, rect)
+    return rect
 def plot_snake(window, color, snake_list, snake_size):
     for x, y in snake_list:
         pygame.draw.rect(window, color, [x, y, snake_size, snake_size])
-def welcome():
+class GameRenderer:
+    # Draws a SnakeSim frame by frame, touching only the parts of the screen that changed:
+    # the new head, the evicted tail, the food and the score line.
+    def __init__(self, sim):
+        self.sim = sim
+        # Static layer: white fill with the background image on top, composed once
+        self.background = pygame.Surface((screen_width, screen_height)).convert()
+        self.background.fill(white)
+        self.background.blit(bg_img, (0, 0))
+        self.hud_text = None
+        self.hud = []
+        self.hud_rect = pygame.Rect(5, 5, 0, 0)
+        self.food_rect = None
+        self.full_redraw = True
+    def segments_near(self, rect):
+        # Body segments overlapping rect, found through the occupancy counter instead of the whole body
+        step = init_velocity
+        first_x = (rect.left - snake_size) // step * step + step
+        first_y = (rect.top - snake_size) // step * step + step
+        for x in range(first_x, rect.right, step):
+            for y in range(first_y, rect.bottom, step):
+                if (x, y) in self.sim.occupied:
+                    yield x, y
+    def repair(self, rect):
+        # Redraw one region in the same order as a full frame: background, score, food, snake
+        window.set_clip(rect)
+        window.blit(self.background, rect, rect)
+        if self.hud_rect.colliderect(rect):
+            window.blits(self.hud)
+        if self.food_rect.colliderect(rect):
+            pygame.draw.rect(window, red, self.food_rect)
+        for x, y in self.segments_near(rect):
+            pygame.draw.rect(window, green, [x, y, snake_size, snake_size])
+        window.set_clip(None)
+    def draw(self, hi_score):
+        # Draw the current frame and return the list of rects that changed
+        sim = self.sim
+        dirty = []
+        hud_text = f"Score: {sim.score}"+ f"    High-Score: {hi_score}"
+        if hud_text != self.hud_text:
+            self.hud_text = hud_text
+            self.hud = layout_text(hud_text, cyan, 5, 5)
+            dirty.append(self.hud_rect)
+            self.hud_rect = self.hud[0][1].unionall([rect for _, rect in self.hud])
+            dirty.append(self.hud_rect)
+        food_rect = pygame.Rect(sim.food_x, sim.food_y, snake_size, snake_size)
+        if food_rect != self.food_rect:
+            if self.food_rect:
+                dirty.append(self.food_rect)
+            self.food_rect = food_rect
+            dirty.append(food_rect)
+        if self.full_redraw:
+            self.full_redraw = False
+            window.blit(self.background, (0, 0))
+            window.blits(self.hud)
+            pygame.draw.rect(window, red, self.food_rect)
+            plot_snake(window, green, sim.snake_list, snake_size)
+            return [window.get_rect()]
+        if sim.evicted:
+            dirty.append(pygame.Rect(sim.evicted[0], sim.evicted[1], snake_size, snake_size))
+        for rect in dirty:
+            self.repair(rect)
+        head = pygame.Rect(sim.snake_x, sim.snake_y, snake_size, snake_size)
+        pygame.draw.rect(window, green, head)
+        dirty.append(head)
+        return dirty
+# Screens are scenes in a single main loop: each frame the loop pumps events once, lets the
+# current scene handle them, draws it and ticks the clock once. A scene switches screens by
+# returning the next scene, so restarting never nests calls and the stack stays flat.
+class Scene:
     fps = 60
-    exit_game = False
-    while not exit_game:
+    def handle(self, event):
+        return self
+    def update(self):
+        return self
+    def draw(self):
+        # Return the rects that changed, or None for the whole screen
+        return None
+    def invalidate(self):
+        # Something was drawn over the scene: repaint all of it next frame
+        pass
+class WelcomeScene(Scene):
+    fps = 15  # static screen: sleep between frames instead of redrawing 60 times a second
+    def handle(self, event):
+        if (event.type == pygame.KEYDOWN) and (event.key == pygame.K_SPACE):
+            assets.play_music("Back.mp3")
+            return PlayingScene(autopilot=autopilot)
+        return self
+    def draw(self):
         window.fill(pink)
         screen_text("Welcome to Snakes!", green, screen_width/3, (screen_height/2)- 40)
         screen_text("(Press Spacebar To Play.)", cyan, screen_width/3.4, (screen_height/2))
+        return None
+class PlayingScene(Scene):
+    def __init__(self, replay=None, fast=False, autopilot=False):
+        self.music_on = True
+        # A new game gets a fresh seed and records its inputs; given a replay, the scene plays it back
+        self.playback = replay is not None
+        self.replay = replay if self.playback else Replay(int.from_bytes(os.urandom(8), "little"))
+        self.replay_actions = self.replay.actions() if self.playback else None
+        if fast:
+            self.fps = 0  # no frame cap: render the replay as fast as possible
+        self.sim = SnakeSim(self.replay.seed)
+        self.pilot = Autopilot(self.sim) if autopilot and not self.playback else None
+        self.scored = not self.playback and self.pilot is None  # only games the player plays count for scores
+        self.renderer = GameRenderer(self.sim)
+        self.action = NONE
+        self.hi_score = scores.best
+    def handle(self, event):
+        if (event.type == pygame.KEYDOWN):
+            if event.key == pygame.K_LALT or event.key == pygame.K_RALT:
+                return PausedScene(self)
+            if event.key in key_actions and self.scored:
+                self.action = key_actions[event.key]
+            if event.key == pygame.K_m:
+                if self.music_on:
+                    pygame.mixer.music.pause()
+                    self.music_on = False
+                else:
+                    pygame.mixer.music.unpause()
+                    self.music_on = True
+        return self
+    def update(self):
+        sim = self.sim
+        if self.playback:
+            if sim.frame >= self.replay.frames:
+                return WelcomeScene()
+            self.action = self.replay_actions.get(sim.frame, NONE)
+        else:
+            if self.pilot:
+                self.action = self.pilot.decide()
+            self.replay.record(sim.frame, self.action)
+        game_over = sim.step(self.action)
+        self.action = NONE
+        if sim.ate and (sim.score > self.hi_score) and self.scored:
+            self.hi_score = sim.score
+        if game_over:
+            if self.scored:
+                scores.submit(sim.score, player)
+            if not self.playback:
+                # Written and pruned on the score store's background thread, so the game never waits on the disk
+                folder = data_path("Replays")
+                scores.save(os.path.join(folder, replay_file_name(self.replay)), self.replay.to_bytes(),
+                            after=lambda: prune_replays(folder))
+            pygame.mixer.music.stop()
+            assets.play_sound("Game Over.mp3", effects)
+            return GameOverScene()
+        return self
+    def draw(self):
+        return self.renderer.draw(self.hi_score)
+    def invalidate(self):
+        self.renderer.full_redraw = True
+class PausedScene(Scene):
+    fps = 15
+    def __init__(self, game):
+        self.game = game
+    def handle(self, event):
+        if (event.type == pygame.KEYDOWN) and (event.key == pygame.K_LALT or event.key == pygame.K_RALT):
+            self.game.renderer.full_redraw = True
+            return self.game
+        return self
+    def draw(self):
+        screen_text("Paused (Press Alt to Resume.)", red, screen_width / 4, screen_height / 2)
+        return None
+class GameOverScene(Scene):
+    fps = 15
+    def handle(self, event):
+        if (event.type == pygame.KEYDOWN) and (event.key == pygame.K_RETURN):
+            return WelcomeScene()
+        return self
+    def draw(self):
+        window.fill(white)
+        screen_text("GAME OVER! (Press Enter To Continue.)", red, screen_width/5, (screen_height/2) - 20)
+        screen_text(f"{player}'s Best: {scores.player_best(player)}", cyan, screen_width/5, (screen_height/2) + 30)
+        return None
+def main_loop(scene=None, quit_after=None):
+    # Each phase of the frame is timed by the profiler: see frame_profiler.phases.
+    # quit_after: leave after that many frames (smoke runs and cold-start timing)
+    global show_profiler
+    scene = scene or WelcomeScene()
+    while True:
         for event in pygame.event.get():
             if (event.type == pygame.QUIT):
-                exit_game = True
-            if (event.type == pygame.KEYDOWN):
-                if event.key == pygame.K_SPACE:
-                    pygame.mixer.music.load(resource_path("Back.mp3"))
-                    pygame.mixer.music.play()
-                    gameloop()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                exit_game = True
-        pygame.display.update()
-        clock.tick(fps)
-def gameloop():
-    exit_game = False
-    game_over = False
-    paused = False
-    music_on = True
-    snake_x = 100
-    snake_y = 100
-    snake_size = 20
-    velocity_x = 0
-    velocity_y = 0
-    snake_list = []
-    snake_length = 1
-    food_x = random.randint(50, (screen_width - 50))
-    food_y = random.randint(50, (screen_height - 50))
-    score = 0
-    init_velocity = 5
-    fps = 60
-    if (not os.path.exists("High Score.txt")):
-        with open("High Score.txt", "w") as f:
-            f.write("0")
-    with open("High Score.txt", "r") as f:
-        hi_score = f.read()
-    while not exit_game:
-        if game_over:
-            with open("High Score.txt", "w") as f:
-                f.write(str(hi_score))
-            window.fill(white)
-            screen_text("GAME OVER! (Press Enter To Continue.)", red, screen_width/5, (screen_height/2) - 20)
-            for event in pygame.event.get():
-                if (event.type == pygame.QUIT):
-                    exit_game = True
-                if (event.type == pygame.KEYDOWN):
-                    if event.key == pygame.K_RETURN:
-                        welcome()
+                return
+            if (event.type == pygame.KEYDOWN) and (event.key == pygame.K_F3):
+                show_profiler = not show_profiler
+                scene.invalidate()
+                continue
+            scene = scene.handle(event)
+        profiler.mark("events")
+        scene = scene.update()
+        profiler.mark("update")
+        dirty = scene.draw()
+        profiler.mark("draw")
+        if show_profiler:
+            overlay_rect = draw_profiler()
+            if dirty is not None:
+                dirty.append(overlay_rect)
+        profiler.mark("overlay")
+        if dirty is None:
+            pygame.display.update()
         else:
-            for event in pygame.event.get():
-                if (event.type == pygame.QUIT):
-                    exit_game = True
-                if (event.type == pygame.KEYDOWN):
-                    if event.key == pygame.K_LALT or event.key == pygame.K_RALT:
-                        paused = True
-                        while paused:
-                            screen_text("Paused (Press Alt to Resume.)", red, screen_width / 4, screen_height / 2)
-                            pygame.display.update()
-                            for ev in pygame.event.get():
-                                if ev.type == pygame.QUIT:
-                                    pygame.quit()
-                                    quit()
-                                if ev.type == pygame.KEYDOWN:
-                                    if ev.key == pygame.K_LALT or ev.key == pygame.K_RALT:
-                                        paused = False
-                    if event.key == pygame.K_UP:
-                        velocity_y = -init_velocity
-                        velocity_x = 0
-                    if event.key == pygame.K_DOWN:
-                        velocity_y = init_velocity
-                        velocity_x = 0
-                    if event.key == pygame.K_LEFT:
-                        velocity_x = -init_velocity
-                        velocity_y = 0
-                    if event.key == pygame.K_RIGHT:
-                        velocity_x = init_velocity
-                        velocity_y = 0
-                    if event.key == pygame.K_m:
-                        if music_on:
-                            pygame.mixer.music.pause()
-                            music_on = False
-                        else:
-                            pygame.mixer.music.unpause()
-                            music_on = True
-            snake_x += velocity_x
-            snake_y += velocity_y
-            if (abs(snake_x - food_x) < 6) and (abs(snake_y - food_y) < 6):
-                score += 10
-                food_x = random.randint(50, 850)
-                food_y = random.randint(50, 550)
-                snake_length += 5
-                if (score > int(hi_score)):
-                    hi_score = score
-            window.fill(white)
-            window.blit(bg_img, (0, 0))
-            screen_text(f"Score: {score}"+ f"    High-Score: {hi_score}", cyan, 5, 5)
-            pygame.draw.rect(window, red, [food_x, food_y, snake_size, snake_size])
-            head = []
-            head.append(snake_x)
-            head.append(snake_y)
-            snake_list.append(head)
-            if len(snake_list)> snake_length:
-                del(snake_list[0])
-            if head in snake_list[:-1]:
-                game_over = True
-                pygame.mixer.music.load(resource_path("Game Over.mp3"))
-                pygame.mixer.music.play()
-            if (snake_x < 0) or (snake_x > screen_width) or (snake_y < 0) or (snake_y > screen_height):
-                game_over = True
-                pygame.mixer.music.load(resource_path("Game Over.mp3"))
-                pygame.mixer.music.play()
-            plot_snake(window, green, snake_list, snake_size)
-        pygame.display.update()
-        clock.tick(fps)
-welcome()
-pygame.quit()
+            pygame.display.update(dirty)
+        profiler.mark("display")
+        clock.tick(scene.fps)
+        profiler.mark("wait")
+        profiler.end_frame(type(scene).__name__)
+        if quit_after and profiler.frame >= quit_after:
+            return
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snakes")
+    parser.add_argument("--replay", metavar="FILE", help="watch a recorded game (.snkr from the Replays folder)")
+    parser.add_argument("--player", default="Player", help="name the score is saved under in Leaderboard.json")
+    parser.add_argument("--autopilot", action="store_true", help="let the bot play (its scores aren't saved)")
+    parser.add_argument("--fast", action="store_true", help="play the replay or autopilot game without the frame cap")
+    parser.add_argument("--profile", action="store_true", help="start with the frame-time overlay shown (F3 toggles it)")
+    parser.add_argument("--telemetry", metavar="FILE", help="save every frame's timings to FILE (.csv or .json) on exit")
+    parser.add_argument("--quit-after", type=int, metavar="FRAMES", help="exit on its own after this many frames")
+    args = parser.parse_args()
+    show_profiler = args.profile
+    autopilot = args.autopilot
+    setup(args.player, keep_frames=bool(args.telemetry))
+    if args.replay:
+        main_loop(PlayingScene(Replay.load(args.replay), args.fast), args.quit_after)
+    elif args.autopilot:
+        main_loop(PlayingScene(fast=args.fast, autopilot=True), args.quit_after)
+    else:
+        main_loop(quit_after=args.quit_after)
+    scores.flush()
+    if args.telemetry:
+        profiler.dump(args.telemetry, {"assets": assets.stats()})
+        print(f"Frame timings saved to {args.telemetry}")
+    pygame.quit()
@@ -0,0 +1,86 @@
+import os
+import threading
+from time import perf_counter
+import pygame
+
+# Images and sounds are loaded and decoded once and then kept, so screen transitions never wait on
+# file I/O or MP3 decoding. Sounds can be decoded on a background thread while the welcome screen is
+# up; asking for one that isn't ready yet waits for just that file.
+
+class AssetManager:
+    def __init__(self, locate):
+        self.locate = locate      # asset name -> path on disk (resource_path)
+        self.images = {}          # (name, size) -> converted surface
+        self.sounds = {}          # name -> pygame.mixer.Sound, or None if it couldn't be loaded
+        self.ready = {}           # name -> Event, for sounds being decoded in the background
+        self.load_times = {}      # name -> seconds spent loading it
+        self.music_name = None
+
+    def record(self, name, start):
+        self.load_times[name] = perf_counter() - start
+
+    def image(self, name, size=None):
+        key = (name, size)
+        if key not in self.images:
+            start = perf_counter()
+            surface = pygame.image.load(self.locate(name))
+            if size:
+                surface = pygame.transform.scale(surface, size)
+            self.images[key] = surface.convert_alpha()
+            self.record(name, start)
+        return self.images[key]
+
+    def preload_sounds(self, names):
+        # Decode the sounds on a background thread; sound() waits for any that aren't done yet
+        for name in names:
+            self.ready[name] = threading.Event()
+        threading.Thread(target=self.load_sounds, args=(names,), name="AssetLoader", daemon=True).start()
+
+    def load_sounds(self, names):
+        for name in names:
+            self.load_sound(name)
+
+    def load_sound(self, name):
+        start = perf_counter()
+        try:
+            self.sounds[name] = pygame.mixer.Sound(self.locate(name))
+        except pygame.error as e:
+            print(f"Couldn't load {name}: {e}")
+            self.sounds[name] = None
+        self.record(name, start)
+        if name in self.ready:
+            self.ready[name].set()
+
+    def sound(self, name):
+        if name in self.ready:
+            self.ready[name].wait()
+        elif name not in self.sounds:
+            self.load_sound(name)
+        return self.sounds[name]
+
+    def play_sound(self, name, channel):
+        # Play a short effect on its own channel, leaving the music channel alone
+        sound = self.sound(name)
+        if sound is not None:
+            channel.play(sound)
+
+    def play_music(self, name):
+        # Music is streamed, so only opening the file is paid for, and only when the track changes
+        if name != self.music_name:
+            start = perf_counter()
+            pygame.mixer.music.load(self.locate(name))
+            self.record(name, start)
+            self.music_name = name
+        pygame.mixer.music.play()
+
+    def stats(self):
+        # Load time and file size of everything loaded so far, slowest first
+        stats = []
+        for name, seconds in sorted(self.load_times.items(), key=lambda item: -item[1]):
+            path = self.locate(name)
+            stats.append({
+                "asset": name,
+                "load_ms": round(1000 * seconds, 3),
+                "bytes": os.path.getsize(path) if os.path.exists(path) else 0,
+            })
+        return stats
@@ -0,0 +1,79 @@
+import csv
+import json
+import math
+from time import perf_counter
+from collections import deque
+
+# Frame-time instrumentation for the Snakes main loop. The loop calls mark() after each phase;
+# every call is one perf_counter() and a dict store, cheap enough to leave on all the time.
+
+phases = ("events", "update", "draw", "overlay", "display", "wait")
+
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+class FrameProfiler:
+    def __init__(self, window=300, keep_history=False):
+        # window: frames used for the live stats; keep_history: keep every frame for dump()
+        self.recent = deque(maxlen=window)
+        self.history = [] if keep_history else None
+        self.frame = 0
+        self.times = {}
+        self.last = perf_counter()
+
+    def mark(self, phase):
+        # Close the current phase: it took the time since the previous mark
+        now = perf_counter()
+        self.times[phase] = now - self.last
+        self.last = now
+
+    def end_frame(self, scene=""):
+        times = self.times
+        row = (self.frame, scene, *[times.get(phase, 0.0) for phase in phases])
+        self.recent.append(row)
+        if self.history is not None:
+            self.history.append(row)
+        self.frame += 1
+        self.times = {}
+
+    def summary(self, rows=None):
+        # Per-phase means, FPS and frame-time percentiles (milliseconds) over rows (default: the live window)
+        rows = self.recent if rows is None else rows
+        if not rows:
+            return {}
+        totals = sorted(sum(row[2:]) for row in rows)
+        mean_total = sum(totals) / len(totals)
+        stats = {
+            "frames": len(rows),
+            "fps": round(1 / mean_total, 1) if mean_total else 0.0,
+            "p50_ms": round(1000 * percentile(totals, 50), 3),
+            "p95_ms": round(1000 * percentile(totals, 95), 3),
+            "p99_ms": round(1000 * percentile(totals, 99), 3),
+            "max_ms": round(1000 * totals[-1], 3),
+        }
+        for index, phase in enumerate(phases, start=2):
+            stats[phase + "_ms"] = round(1000 * sum(row[index] for row in rows) / len(rows), 3)
+        return stats
+
+    def dump(self, path, extra=None):
+        # Write every recorded frame as CSV, or frames plus a summary (and any extra sections) as JSON,
+        # picked by the file extension
+        rows = self.history if self.history is not None else list(self.recent)
+        columns = ["frame", "scene"] + [phase + "_ms" for phase in phases]
+        if path.lower().endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "summary": self.summary(rows),
+                    **(extra or {}),
+                    "frames": [dict(zip(columns, row[:2] + tuple(round(1000 * t, 4) for t in row[2:]))) for row in rows],
+                }, f, indent=1)
+        else:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for row in rows:
+                    writer.writerow([row[0], row[1]] + [f"{1000 * t:.4f}" for t in row[2:]])
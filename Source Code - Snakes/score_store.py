@@ -0,0 +1,95 @@
+import os
+import json
+import threading
+
+# High score and per-player leaderboard kept in memory as integers. Saving never blocks the game:
+# changes are handed to a background thread that writes each file atomically (temp file + rename),
+# so a crash mid-write can't leave a half-written score behind. The game queues its other files
+# (replays) on the same thread with save().
+
+def atomic_write(path, data):
+    # data is text or bytes; missing folders are created
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data.encode("utf-8") if isinstance(data, str) else data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+class HighScoreStore:
+    def __init__(self, path, leaderboard_path=None, default_path=None):
+        # default_path is read when path doesn't exist yet (e.g. the copy bundled with the exe)
+        self.path = path
+        self.leaderboard_path = leaderboard_path
+        self.best = self.read_score(path if os.path.exists(path) else default_path)
+        self.leaderboard = self.read_leaderboard()  # player -> best score
+        self.pending = {}  # path -> (data, after) waiting to be written
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.idle = threading.Event()
+        self.idle.set()
+        self.thread = threading.Thread(target=self.writer, name="HighScoreWriter", daemon=True)
+        self.thread.start()
+
+    def read_score(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except (TypeError, OSError, ValueError):
+            return 0
+
+    def read_leaderboard(self):
+        try:
+            with open(self.leaderboard_path, encoding="utf-8") as f:
+                return {str(name): int(score) for name, score in json.load(f).items()}
+        except (TypeError, OSError, ValueError, AttributeError):
+            return {}
+
+    def player_best(self, player):
+        return self.leaderboard.get(player, 0)
+
+    def top(self, count=5):
+        return sorted(self.leaderboard.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def submit(self, score, player=None):
+        # Record a finished game; only scores that beat a stored one cause a write.
+        # Returns True for a new overall high score.
+        new_best = score > self.best
+        if new_best:
+            self.best = score
+            self.save(self.path, str(score))
+        if player and self.leaderboard_path and score > self.player_best(player):
+            self.leaderboard[player] = score
+            self.save(self.leaderboard_path, json.dumps(dict(self.top(len(self.leaderboard))), indent=2))
+        return new_best
+
+    def save(self, path, data, after=None):
+        # Queue data (text or bytes) for path; after() runs on the writer thread once it is written
+        with self.lock:
+            self.pending[path] = (data, after)  # a newer score for the same file replaces the queued one
+            self.idle.clear()
+        self.wake.set()
+
+    def writer(self):
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+            with self.lock:
+                pending, self.pending = self.pending, {}
+            for path, (data, after) in pending.items():
+                try:
+                    atomic_write(path, data)
+                    if after:
+                        after()
+                except OSError as e:
+                    print(f"Couldn't save {path}: {e}")
+            with self.lock:
+                if not self.pending:
+                    self.idle.set()
+
+    def flush(self, timeout=5):
+        # Wait for queued writes to reach the disk (call before exiting)
+        return self.idle.wait(timeout)
@@ -0,0 +1,270 @@
+import time
+import heapq
+import argparse
+from collections import deque
+from snake_sim import SnakeSim, NONE, UP, DOWN, LEFT, RIGHT, init_velocity, velocities
+
+# A bot that plays SnakeSim. The board is a grid of 5-pixel cells (one per movement step) and the
+# bot keeps a BFS distance field from the food over the cells the body doesn't cover. Each tick only
+# the cells the body just entered or left are patched in the field, so planning stays cheap however
+# long the snake gets; the field is rebuilt from scratch only when the food moves.
+#
+# Patches may leave a distance too high (shortcuts opened by the tail are spread only so far), but
+# every reachable cell always keeps a neighbor with a lower distance, so walking downhill from any
+# cell still ends at the food.
+
+unreachable = 1 << 30
+grids = {}  # (cols, rows) -> (steps, neighbors), shared by every Autopilot on a board that size
+
+def grid(cols, rows):
+    # Neighbor cell for each action (-1 off the board) and each cell's neighbors; cell = col * rows + row
+    if (cols, rows) not in grids:
+        cells = cols * rows
+        steps = {
+            UP: [cell - 1 if cell % rows else -1 for cell in range(cells)],
+            DOWN: [cell + 1 if cell % rows != rows - 1 else -1 for cell in range(cells)],
+            LEFT: [cell - rows if cell >= rows else -1 for cell in range(cells)],
+            RIGHT: [cell + rows if cell < cells - rows else -1 for cell in range(cells)],
+        }
+        neighbors = [tuple(n for n in around if n >= 0) for around in zip(*steps.values())]
+        grids[cols, rows] = steps, neighbors
+    return grids[cols, rows]
+
+class Autopilot:
+    def __init__(self, sim):
+        self.sim = sim
+        self.cols = sim.width // init_velocity + 1
+        self.rows = sim.height // init_velocity + 1
+        cells = self.cols * self.rows
+        self.steps, self.neighbors = grid(self.cols, self.rows)
+        self.blocked = bytearray(cells)
+        self.dist = [unreachable] * cells
+        self.body = None      # the sim's body deque the field was built for (a new one means a new game)
+        self.frame = None     # sim frame the field matches
+        self.food = None
+        self.decisions = 0
+        self.rebuilds = 0
+        self.patched = 0      # cells whose distance was repaired incrementally
+        self.repair_budget = 64
+
+    def cell(self, x, y):
+        return (x // init_velocity) * self.rows + (y // init_velocity)
+
+    def sync(self):
+        # Bring the blocked cells and the distance field up to date with the sim
+        sim = self.sim
+        food = self.cell(sim.food_x, sim.food_y)
+        if self.body is not sim.snake_list or self.frame != sim.frame - 1 or food != self.food:
+            self.rebuild(food)
+        else:
+            if sim.snake_list:
+                head = self.cell(*sim.snake_list[-1])
+                if not self.blocked[head]:
+                    self.block(head)
+            if sim.evicted and sim.evicted not in sim.occupied:
+                self.unblock(self.cell(*sim.evicted))
+        self.frame = sim.frame
+
+    def rebuild(self, food):
+        sim = self.sim
+        self.rebuilds += 1
+        self.body = sim.snake_list
+        self.food = food
+        self.blocked = bytearray(len(self.blocked))
+        for x, y in sim.occupied:
+            if 0 <= x <= sim.width and 0 <= y <= sim.height:
+                self.blocked[self.cell(x, y)] = 1
+        dist = self.dist = [unreachable] * len(self.blocked)
+        if self.blocked[food]:
+            return
+        dist[food] = 0
+        queue = deque([food])
+        while queue:
+            cell = queue.popleft()
+            d = dist[cell] + 1
+            for n in self.neighbors[cell]:
+                if d < dist[n] and not self.blocked[n]:
+                    dist[n] = d
+                    queue.append(n)
+
+    def block(self, cell):
+        # The body entered cell: cut it out of the field, then re-route only the cells whose
+        # way downhill ran through it (those left with no lower neighbor)
+        dist, blocked, neighbors = self.dist, self.blocked, self.neighbors
+        blocked[cell] = 1
+        old = dist[cell]
+        dist[cell] = unreachable
+        if old == unreachable:
+            return
+        orphans = []
+        stack = [(cell, old)]
+        while stack:
+            parent, d = stack.pop()
+            for n in neighbors[parent]:
+                dn = dist[n]
+                if d < dn < unreachable:
+                    for m in neighbors[n]:
+                        if dist[m] < dn:
+                            break
+                    else:
+                        dist[n] = unreachable
+                        orphans.append(n)
+                        stack.append((n, dn))
+        heap = []
+        for n in orphans:
+            best = min([dist[m] for m in neighbors[n]]) + 1
+            if best < dist[n]:
+                dist[n] = best
+                heap.append((best, n))
+        heapq.heapify(heap)
+        while heap:
+            d, n = heapq.heappop(heap)
+            if d > dist[n]:
+                continue
+            for m in neighbors[n]:
+                if d + 1 < dist[m] and not blocked[m]:
+                    dist[m] = d + 1
+                    heapq.heappush(heap, (d + 1, m))
+        self.patched += len(orphans) + 1
+
+    def unblock(self, cell):
+        # The tail left cell: give it a distance and spread the shortcut it opens to a few cells
+        dist, blocked, neighbors = self.dist, self.blocked, self.neighbors
+        blocked[cell] = 0
+        best = 0 if cell == self.food else min([dist[n] for n in neighbors[cell]]) + 1
+        if best >= dist[cell]:
+            return
+        dist[cell] = best
+        queue = deque([cell])
+        budget = self.repair_budget
+        while queue and budget:
+            budget -= 1
+            n = queue.popleft()
+            d = dist[n] + 1
+            for m in neighbors[n]:
+                if d < dist[m] and not blocked[m]:
+                    dist[m] = d
+                    queue.append(m)
+                    self.patched += 1
+        self.patched += 1
+
+    def reaches_food(self, cell, avoid):
+        # Walk downhill through the distance field from cell to the food without stepping on avoid
+        dist, neighbors = self.dist, self.neighbors
+        d = dist[cell]
+        while d:
+            for n in neighbors[cell]:
+                if dist[n] < d and n != avoid:
+                    cell = n
+                    d = dist[n]
+                    break
+            else:
+                return False
+        return True
+
+    def safe(self, head, tail):
+        # Can the snake still reach its tail after its head moves onto `head`? The tail moves on,
+        # so as long as it is reachable the snake can follow itself around instead of getting boxed in.
+        # Usually the distance field answers it: head and tail both connect to the food. Walking
+        # downhill from head never passes head again, and the tail's walk is made to avoid it.
+        dist = self.dist
+        if head == tail:
+            return True
+        if dist[head] < unreachable:
+            for n in self.neighbors[tail]:
+                if n != head and dist[n] < unreachable and self.reaches_food(n, head):
+                    return True
+        return self.tail_reachable(head, tail)
+
+    def tail_reachable(self, head, tail):
+        # A* from head to tail over free cells, for when the food can't vouch for the route
+        if head == tail:
+            return True
+        rows = self.rows
+        tail_col, tail_row = divmod(tail, rows)
+        blocked, neighbors = self.blocked, self.neighbors
+        seen = {head}
+        heap = [(0, 0, head)]
+        while heap:
+            _, g, cell = heapq.heappop(heap)
+            for n in neighbors[cell]:
+                if n == tail:
+                    return True
+                if n not in seen and not blocked[n]:
+                    seen.add(n)
+                    col, row = divmod(n, rows)
+                    heapq.heappush(heap, (g + 1 + abs(col - tail_col) + abs(row - tail_row), g + 1, n))
+        return False
+
+    def decide(self):
+        # Action for the next step: NONE keeps the current direction
+        self.decisions += 1
+        self.sync()
+        sim = self.sim
+        head = self.cell(sim.snake_x, sim.snake_y)
+        body = sim.snake_list
+        tail = self.cell(*body[0]) if body else head
+        tail_moves = len(body) + 1 > sim.snake_length  # the step after this one evicts the tail
+        current = next((a for a, v in velocities.items() if v == (sim.velocity_x, sim.velocity_y)), NONE)
+
+        moves = []
+        for action in velocities:
+            n = self.steps[action][head]
+            if n < 0 or (self.blocked[n] and not (n == tail and tail_moves)):
+                continue
+            # The neck can't be reversed into once the snake is longer than one cell
+            if len(body) > 1 and n == self.cell(*body[-2]):
+                continue
+            moves.append((self.dist[n], action != current, action, n))
+        if not moves:
+            return NONE
+        moves.sort()
+
+        chosen = moves[0]
+        if len(body) > 3:
+            for move in moves:
+                _, _, action, n = move
+                new_tail = self.cell(*body[1]) if tail_moves else tail
+                # Try the move on the grid: the head fills n and the old tail (if it moves) frees up
+                was_blocked = self.blocked[n]
+                self.blocked[n] = 1
+                if tail_moves:
+                    self.blocked[tail] = 0
+                safe = self.safe(n, new_tail)
+                self.blocked[n] = was_blocked
+                if tail_moves:
+                    self.blocked[tail] = 1
+                if safe:
+                    chosen = move
+                    break
+        action = chosen[2]
+        return NONE if action == current else action
+
+def benchmark(games=10, seed=0, max_steps=20000):
+    # Plays seeded games headless; returns (decisions per second, average score, results)
+    decisions = 0
+    elapsed = 0.0
+    results = []
+    for game in range(games):
+        sim = SnakeSim(seed + game)
+        pilot = Autopilot(sim)
+        start = time.perf_counter()
+        while not sim.game_over and sim.frame < max_steps:
+            sim.step(pilot.decide())
+        elapsed += time.perf_counter() - start
+        decisions += pilot.decisions
+        results.append((seed + game, sim.score, sim.snake_length, sim.frame, sim.game_over, pilot.rebuilds, pilot.patched))
+    return decisions / elapsed, sum(r[1] for r in results) / games, results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Snakes autopilot on seeded headless games")
+    parser.add_argument("--games", type=int, default=10, help="games to play")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--steps", type=int, default=20000, help="step limit per game")
+    args = parser.parse_args()
+    rate, average, results = benchmark(args.games, args.seed, args.steps)
+    print(f"{'seed':>6}{'score':>8}{'length':>8}{'steps':>8}  {'end':<10}{'rebuilds':>9}{'patched':>10}")
+    for game_seed, score, length, steps, crashed, rebuilds, patched in results:
+        print(f"{game_seed:>6}{score:>8}{length:>8}{steps:>8}  {'crashed' if crashed else 'step limit':<10}"
+              f"{rebuilds:>9}{patched:>10}")
+    print(f"\n{rate:,.0f} decisions per second, average score {average:.1f} over {args.games} games")
@@ -0,0 +1,156 @@
+import time
+import numpy as np
+from snake_sim import SnakeSim, screen_width, screen_height, snake_size, init_velocity, food_score, growth, food_margin
+
+# Thousands of Snakes games stepped together with NumPy, following the same
+# rules as SnakeSim: for training and evaluating bot policies.
+
+# Food picks redrawn before a game gives up and leaves its food where it was (a huge snake may
+# leave almost no room)
+max_food_draws = 64
+
+# Velocity for each action (NONE, UP, DOWN, LEFT, RIGHT); NONE keeps the current one
+action_velocity = np.array([[0, 0], [0, -init_velocity], [0, init_velocity], [-init_velocity, 0], [init_velocity, 0]],
+                           dtype=np.int32)
+
+class SnakeBatch:
+    def __init__(self, n_games, seed=None, max_length=2048, width=screen_width, height=screen_height):
+        # max_length caps how long a snake grows. The ring buffer has one slot more, since the
+        # new head is stored before the tail it replaces is evicted.
+        self.n = n_games
+        self.width = width
+        self.height = height
+        self.max_length = max_length
+        self.ring = max_length + 1
+        self.rng = np.random.default_rng(seed)
+        self.cells_x = width // init_velocity + 1
+        self.cells_y = height // init_velocity + 1
+        self.cells = self.cells_x * self.cells_y
+        self.food_cols = (width - 2 * food_margin) // init_velocity + 1
+        self.food_rows = (height - 2 * food_margin) // init_velocity + 1
+        # Grid cells around a food position a body segment can sit on and still overlap it
+        reach = np.arange(-((snake_size - 1) // init_velocity), (snake_size - 1) // init_velocity + 1)
+        self.footprint = (reach[:, None] * self.cells_y + reach[None, :]).reshape(-1)
+        self.head = np.zeros((n_games, 2), dtype=np.int32)
+        self.velocity = np.zeros((n_games, 2), dtype=np.int32)
+        self.food = np.zeros((n_games, 2), dtype=np.int32)
+        self.body = np.zeros((n_games, self.ring), dtype=np.int32)      # ring buffer of body cell numbers
+        self.tail = np.zeros(n_games, dtype=np.int32)                   # ring index of the oldest segment
+        self.length = np.zeros(n_games, dtype=np.int32)                 # segments currently stored
+        self.snake_length = np.zeros(n_games, dtype=np.int32)           # segments the snake should have
+        self.occupied = np.zeros((n_games, self.cells), dtype=np.uint8)  # body segments per cell
+        self.score = np.zeros(n_games, dtype=np.int32)
+        self.done = np.zeros(n_games, dtype=bool)
+        self.games = np.arange(n_games)
+        # Flat views: per-game offsets turn (game, index) lookups into one cheap 1-D take/put
+        self.body_flat = self.body.reshape(-1)
+        self.occupied_flat = self.occupied.reshape(-1)
+        self.body_offset = self.games * self.ring
+        self.occupied_offset = self.games * self.cells
+        self.reset()
+
+    def reset(self, mask=None):
+        # Restart every game, or only the ones selected by a boolean mask
+        games = self.games if mask is None else self.games[mask]
+        self.head[games] = 100
+        self.velocity[games] = 0
+        self.tail[games] = 0
+        self.length[games] = 0
+        self.snake_length[games] = 1
+        self.occupied[games] = 0
+        self.score[games] = 0
+        self.done[games] = False
+        # Like SnakeSim, keep the first food off the start cell the snake sits on
+        start = self.head[games, 0] // init_velocity * self.cells_y + self.head[games, 1] // init_velocity
+        self.occupied[games, start] = 1
+        self.food[games] = self.spawn_food(games)
+        self.occupied[games, start] = 0
+
+    def spawn_food(self, games):
+        # Food on the 5-pixel grid and never overlapping a body segment. SnakeSim keeps a free-cell index
+        # per game; here the few games whose pick touches their snake just pick again, all in one array op.
+        food = self.food[games].copy()
+        pending = np.arange(len(games))
+        for _ in range(max_food_draws):
+            if not len(pending):
+                break
+            x = food_margin + self.rng.integers(0, self.food_cols, len(pending)) * init_velocity
+            y = food_margin + self.rng.integers(0, self.food_rows, len(pending)) * init_velocity
+            cells = (x // init_velocity * self.cells_y + y // init_velocity)[:, None] + self.footprint
+            on_snake = self.occupied[games[pending][:, None], cells].any(axis=1)
+            food[pending[~on_snake], 0] = x[~on_snake]
+            food[pending[~on_snake], 1] = y[~on_snake]
+            pending = pending[on_snake]
+        return food
+
+    def step(self, actions):
+        # Advance every running game one frame; returns (ate, done) boolean arrays.
+        # Finished games stay frozen until reset(). Everything works on whole
+        # arrays, with `alive` used as a 0/1 weight instead of selecting subsets.
+        actions = np.asarray(actions)
+        alive = ~self.done
+        turning = alive & (actions > 0)
+        self.velocity = np.where(turning[:, None], action_velocity[actions], self.velocity)
+        self.head += self.velocity * alive[:, None]
+
+        ate = alive & (np.abs(self.head - self.food) < 6).all(axis=1)
+        if ate.any():
+            self.score[ate] += food_score
+            self.snake_length[ate] = np.minimum(self.snake_length[ate] + growth, self.max_length)
+
+        x, y = self.head[:, 0], self.head[:, 1]
+        inside = (x >= 0) & (x <= self.width) & (y >= 0) & (y <= self.height)
+        cell_x = np.clip(x // init_velocity, 0, self.cells_x - 1)
+        cell_y = np.clip(y // init_velocity, 0, self.cells_y - 1)
+        head_index = self.occupied_offset + cell_x * self.cells_y + cell_y
+        moving = alive & inside
+
+        # Append the head to each ring buffer and mark its cell; for frozen games
+        # the write lands in an unused slot and the counts don't change
+        slot = (self.tail + self.length) % self.ring
+        self.body_flat[self.body_offset + slot] = head_index - self.occupied_offset
+        self.length += moving
+        self.occupied_flat[head_index] += moving.view(np.uint8)
+
+        # Evict tails of snakes that are now longer than they should be
+        evict = (self.length > self.snake_length) & moving
+        tail_index = self.occupied_offset + self.body_flat[self.body_offset + self.tail]
+        self.occupied_flat[tail_index] -= evict.view(np.uint8)
+        self.tail = (self.tail + evict) % self.ring
+        self.length -= evict
+
+        if ate.any():
+            # Placed after the bodies have moved, so new food is never under a snake
+            self.food[ate] = self.spawn_food(self.games[ate])
+
+        crashed = self.occupied_flat[head_index] > 1
+        self.done |= alive & (crashed | ~inside)
+        return ate, self.done.copy()
+
+def benchmark(n_games=4096, steps=200, seed=0):
+    # Steps per second for the batch versus looping SnakeSim over the same number of games
+    rng = np.random.default_rng(seed)
+    actions = rng.choice(5, size=(steps, n_games), p=[0.7, 0.075, 0.075, 0.075, 0.075])
+
+    batch = SnakeBatch(n_games, seed)
+    start = time.perf_counter()
+    for step_actions in actions:
+        _, done = batch.step(step_actions)
+        if done.any():
+            batch.reset(done)
+    batch_rate = n_games * steps / (time.perf_counter() - start)
+
+    sims = [SnakeSim(seed + i) for i in range(n_games)]
+    loop_steps = max(1, steps // 10)
+    start = time.perf_counter()
+    for step_actions in actions[:loop_steps].tolist():
+        for sim, action in zip(sims, step_actions):
+            if sim.step(action):
+                sim.reset()
+    loop_rate = n_games * loop_steps / (time.perf_counter() - start)
+    return batch_rate, loop_rate
+
+if __name__ == "__main__":
+    batch_rate, loop_rate = benchmark()
+    print(f"SnakeBatch: {batch_rate:,.0f} game-steps per second")
+    print(f"SnakeSim loop: {loop_rate:,.0f} game-steps per second ({batch_rate / loop_rate:.1f}x slower)")
@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import struct
+from snake_sim import SnakeSim, NONE
+
+# A replay is the game's seed plus the frames where the player pressed a direction:
+# SnakeSim is deterministic for a given seed, so that's enough to rebuild the whole game.
+# File layout: header (magic, version, seed, frame count), then one 5-byte record per input.
+
+magic = b"SNKR"
+version = 3  # 2: food on the movement grid, 3: food kept clear of the whole body; older replays play back differently
+header = struct.Struct("<4sBQI")  # magic, version, seed, frames played
+record = struct.Struct("<IB")     # frame index, action
+max_replays = 100  # replays kept in a folder by prune_replays(); older ones are deleted
+
+class Replay:
+    def __init__(self, seed, inputs=None, frames=0):
+        self.seed = seed
+        self.inputs = inputs if inputs is not None else []  # [(frame, action)] in frame order
+        self.frames = frames
+
+    def record(self, frame, action):
+        # Call once per simulated frame with the action passed to SnakeSim.step()
+        if action != NONE:
+            self.inputs.append((frame, action))
+        self.frames = frame + 1
+
+    def actions(self):
+        return dict(self.inputs)
+
+    def to_bytes(self):
+        data = bytearray(header.pack(magic, version, self.seed, self.frames))
+        for frame, action in self.inputs:
+            data += record.pack(frame, action)
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data):
+        file_magic, file_version, seed, frames = header.unpack_from(data)
+        if file_magic != magic or file_version != version:
+            raise ValueError("Not a Snakes replay file")
+        inputs = [record.unpack_from(data, offset) for offset in range(header.size, len(data), record.size)]
+        return cls(seed, inputs, frames)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+def replay_file_name(replay):
+    # Sorts by the time the game ended; the seed keeps two games ending in the same second apart
+    return f"{time.strftime('%Y-%m-%d %H-%M-%S')} {replay.seed:016x}.snkr"
+
+def prune_replays(folder, keep=max_replays):
+    # Delete the oldest replays in folder so that at most keep are left
+    try:
+        names = sorted(name for name in os.listdir(folder) if name.endswith(".snkr"))
+    except OSError:
+        return
+    for name in names[:max(0, len(names) - keep)]:
+        try:
+            os.remove(os.path.join(folder, name))
+        except OSError:
+            pass
+
+def play(replay):
+    # Re-run a replay headless as fast as possible; returns the finished SnakeSim
+    sim = SnakeSim(replay.seed)
+    actions = replay.actions()
+    while sim.frame < replay.frames and not sim.step(actions.get(sim.frame, NONE)):
+        pass
+    return sim
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python snake_replay.py <replay.snkr>")
+    else:
+        replay = Replay.load(sys.argv[1])
+        start = time.perf_counter()
+        sim = play(replay)
+        elapsed = time.perf_counter() - start
+        print(f"Seed {replay.seed}, {len(replay.inputs)} inputs, {sim.frame} frames")
+        print(f"Score: {sim.score}{' (game over)' if sim.game_over else ''}")
+        print(f"Replayed in {elapsed * 1000:.1f} ms ({sim.frame / max(elapsed, 1e-9):,.0f} frames per second)")
@@ -0,0 +1,200 @@
+import random
+import time
+from collections import deque, Counter
+
+# Headless Snakes rules: no pygame in here, so the simulation can run as fast
+# as the CPU allows (AI agents, tests, replays) and Snakes.py just draws it.
+
+screen_width = 900
+screen_height = 600
+snake_size = 20
+init_velocity = 5
+food_score = 10
+growth = 5
+food_margin = 50  # food stays at least this far from the edges
+
+# Actions, one per step
+NONE, UP, DOWN, LEFT, RIGHT = range(5)
+velocities = {
+    UP: (0, -init_velocity),
+    DOWN: (0, init_velocity),
+    LEFT: (-init_velocity, 0),
+    RIGHT: (init_velocity, 0),
+}
+
+class FreeCells:
+    # The cells food can spawn on without overlapping the snake, for O(1) uniform picks on any board.
+    # Cells 0..count-1 are kept as a permutation split in two: positions [0, free) hold free cells and
+    # the rest hold taken ones, so taking or giving back a cell is one swap across the split. Only the
+    # entries that differ from the identity are stored, which makes a fresh board (and clear()) cheap.
+    def __init__(self, count):
+        self.count = count
+        self.clear()
+
+    def clear(self):
+        self.free = self.count
+        self.cell_at = {}   # position -> cell, where they differ
+        self.position = {}  # cell -> position, where they differ
+
+    def exchange(self, cell, position, target):
+        # Move cell from position to target, and the cell at target to position
+        cell_at, positions = self.cell_at, self.position
+        other = cell_at.get(target, target)
+        if position == other:
+            del cell_at[position], positions[other]
+        else:
+            cell_at[position] = other
+            positions[other] = position
+        if target == cell:
+            del cell_at[target], positions[cell]
+        else:
+            cell_at[target] = cell
+            positions[cell] = target
+
+    def take(self, cell):
+        position = self.position.get(cell, cell)
+        if position < self.free:
+            self.free -= 1
+            if position != self.free:
+                self.exchange(cell, position, self.free)
+
+    def give_back(self, cell):
+        position = self.position.get(cell, cell)
+        if position >= self.free:
+            if position != self.free:
+                self.exchange(cell, position, self.free)
+            self.free += 1
+
+    def pick(self, rng):
+        # A uniformly random free cell, or None once the snake covers them all
+        if not self.free:
+            return None
+        position = rng.randrange(self.free)
+        return self.cell_at.get(position, position)
+
+class Footprints(dict):
+    # Memoized (x, y) -> footprint lookups: step() needs two per move, and a dict hit beats the arithmetic
+    def __init__(self, footprint):
+        super().__init__()
+        self.footprint = footprint
+
+    def __missing__(self, position):
+        cells = self[position] = self.footprint(*position)
+        return cells
+
+class SnakeSim:
+    def __init__(self, seed=None, width=screen_width, height=screen_height):
+        self.width = width
+        self.height = height
+        # Food sits on the 5-pixel movement grid, in the cells at least food_margin from the edges
+        self.food_cols = (width - 2 * food_margin) // init_velocity + 1
+        self.food_rows = (height - 2 * food_margin) // init_velocity + 1
+        self.free_cells = FreeCells(self.food_cols * self.food_rows)
+        self.footprints = Footprints(self.footprint)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        # Every game gets its own RNG so a seed reproduces the food sequence
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.snake_x = 100
+        self.snake_y = 100
+        self.velocity_x = 0
+        self.velocity_y = 0
+        self.snake_list = deque()
+        self.occupied = Counter()  # cell -> number of body segments on it
+        self.coverage = [0] * self.free_cells.count  # food cell -> body segments it would overlap
+        self.free_cells.clear()
+        self.snake_length = 1
+        self.score = 0
+        self.frame = 0
+        self.game_over = False
+        self.ate = False
+        self.evicted = None
+        # The first steps are spent on the start cell, so keep the first food off it
+        start = self.footprints[self.snake_x, self.snake_y]
+        self.cover(start)
+        self.food_x, self.food_y = self.spawn_food()
+        self.uncover(start)
+        return self
+
+    def footprint(self, x, y):
+        # The food cells whose square would overlap a body segment drawn at (x, y)
+        # (both are snake_size pixels wide)
+        first_col = max(0, -(-(x - snake_size + 1 - food_margin) // init_velocity))
+        last_col = min(self.food_cols - 1, (x + snake_size - 1 - food_margin) // init_velocity)
+        first_row = max(0, -(-(y - snake_size + 1 - food_margin) // init_velocity))
+        last_row = min(self.food_rows - 1, (y + snake_size - 1 - food_margin) // init_velocity)
+        return tuple(col * self.food_rows + row
+                     for col in range(first_col, last_col + 1) for row in range(first_row, last_row + 1))
+
+    def cover(self, cells):
+        coverage, take = self.coverage, self.free_cells.take
+        for cell in cells:
+            count = coverage[cell]
+            coverage[cell] = count + 1
+            if not count:
+                take(cell)
+
+    def uncover(self, cells):
+        coverage, give_back = self.coverage, self.free_cells.give_back
+        for cell in cells:
+            count = coverage[cell] - 1
+            coverage[cell] = count
+            if not count:
+                give_back(cell)
+
+    def spawn_food(self):
+        # O(1) uniform pick among the free cells; with none left the food stays where it is
+        cell = self.free_cells.pick(self.rng)
+        if cell is None:
+            return self.food_x, self.food_y
+        col, row = divmod(cell, self.food_rows)
+        return food_margin + col * init_velocity, food_margin + row * init_velocity
+
+    def step(self, action=NONE):
+        # Advance one frame; returns True once the game is over
+        if self.game_over:
+            return True
+        if action in velocities:
+            self.velocity_x, self.velocity_y = velocities[action]
+        self.snake_x += self.velocity_x
+        self.snake_y += self.velocity_y
+        self.ate = (abs(self.snake_x - self.food_x) < 6) and (abs(self.snake_y - self.food_y) < 6)
+        if self.ate:
+            self.score += food_score
+            self.snake_length += growth
+        head = (self.snake_x, self.snake_y)
+        self.snake_list.append(head)
+        self.occupied[head] += 1
+        if self.occupied[head] == 1:
+            self.cover(self.footprints[head])
+        self.evicted = None
+        if len(self.snake_list) > self.snake_length:
+            self.evicted = self.snake_list.popleft()
+            self.occupied[self.evicted] -= 1
+            if not self.occupied[self.evicted]:
+                del self.occupied[self.evicted]
+                self.uncover(self.footprints[self.evicted])
+        if self.ate:
+            # Placed after the body has moved, so the new food never overlaps the snake
+            self.food_x, self.food_y = self.spawn_food()
+        if self.occupied[head] > 1:
+            self.game_over = True
+        if (self.snake_x < 0) or (self.snake_x > self.width) or (self.snake_y < 0) or (self.snake_y > self.height):
+            self.game_over = True
+        self.frame += 1
+        return self.game_over
+
+def benchmark(steps=200000, seed=0):
+    # Random-policy games back to back; returns steps per second
+    sim = SnakeSim(seed)
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        if sim.step(rng.choice((NONE, NONE, NONE, UP, DOWN, LEFT, RIGHT))):
+            sim.reset(rng.random())
+    return steps / (time.perf_counter() - start)
+
+if __name__ == "__main__":
+    print(f"{benchmark():,.0f} steps per second")
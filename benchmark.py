@@ -0,0 +1,168 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import importlib.util
+
+# "Math Terminal.py" has a space in its name, so it has to be loaded by path
+MATH_TERMINAL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Math Terminal.py")
+
+def load_math_terminal():
+    """Import Math Terminal.py as a module without starting its GUI"""
+    spec = importlib.util.spec_from_file_location("math_terminal", MATH_TERMINAL)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def build_corpus(seed=0, size=40):
+    """Return {group: [commands]} of realistic inputs, generated deterministically from seed"""
+    rng = random.Random(seed)
+    names = ['x', 'y', 'z', 'a', 'b']
+    corpus = {
+        'equation/linear': [],
+        'equation/polynomial': [],
+        'equation/multi-variable': [],
+        'equation/high-degree': [],
+        'nsolve': [],
+        'verify/identity': [],
+        'verify/contradiction': [],
+        'verify/solution': [],
+        'simplify': [],
+        'system': [],
+        'parse': [],
+    }
+    for _ in range(size):
+        a, b, c = rng.randint(2, 50), rng.randint(-100, 100), rng.randint(-100, 100)
+        x = rng.choice(names)
+        corpus['equation/linear'].append(f'equation("{a}*{x} + {b} = {c}")')
+
+        r1, r2 = rng.randint(-9, 9), rng.randint(-9, 9)
+        corpus['equation/polynomial'].append(f'equation("{x}**2 - ({r1 + r2})*{x} + ({r1 * r2}) = 0")')
+        corpus['equation/high-degree'].append(f'equation("{x}**{5 + abs(b) % 8} - {a}*{x} + ({b}) = 0")')
+        corpus['nsolve'].append(f'nsolve("sin({x}) = {x}/{a} + {r1}/10")')
+
+        x, y, z = rng.sample(names, 3)
+        corpus['equation/multi-variable'].append(f'equation("{a}*{x} + {c}*{y} - {z} = {b}")')
+
+        corpus['verify/identity'].append(f'verify("({x} + {a})**2 = {x}**2 + {2 * a}*{x} + {a * a}")')
+        corpus['verify/contradiction'].append(f'verify("{a}*{x} + {b} = {a}*{x} + {b + rng.randint(1, 9)}")')
+        corpus['verify/solution'].append(f'verify("{a}*{x} - {b} = {c}")')
+        corpus['simplify'].append(f'simplify("({x}**2 - {a * a})/({x} - {a}) + {b}*{x} + {c}*{x}")')
+        corpus['system'].append(f'system("{x} + {y} = {a}; {x} - {y} = {b}; {x} + {y} + {z} = {c}")')
+        corpus['parse'].append(f'{a}*{x}**2 + {b}*{x}*{y} - {c}/({z} + {a}) + sin({x})')
+    return corpus
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def summarize(samples):
+    """Latency statistics (milliseconds) and throughput for a list of durations in seconds"""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        'count': len(ordered),
+        'mean_ms': round(1000 * total / len(ordered), 4),
+        'p50_ms': round(1000 * percentile(ordered, 50), 4),
+        'p95_ms': round(1000 * percentile(ordered, 95), 4),
+        'p99_ms': round(1000 * percentile(ordered, 99), 4),
+        'max_ms': round(1000 * ordered[-1], 4),
+        'ops_per_sec': round(len(ordered) / total, 2) if total else 0.0,
+    }
+
+def run_benchmark(corpus, repeat=3, warm_cache=False):
+    """Time every corpus entry on a headless engine; returns {group: stats}"""
+    mt = load_math_terminal()
+    engine = mt.MathEngine()
+
+    # One untimed pass so sympy's own first-use setup doesn't land in the numbers
+    for commands in corpus.values():
+        for command in commands[:2]:
+            if command.endswith(')'):
+                engine.execute_command(command)
+    engine.take_output()
+
+    results = {}
+    for group, commands in corpus.items():
+        samples = []
+        for _ in range(repeat):
+            for command in commands:
+                if not warm_cache:
+                    engine.cache.clear()
+                start = time.perf_counter()
+                if group == 'parse':
+                    engine.parse_expression(command)
+                else:
+                    engine.parse_command(command)
+                samples.append(time.perf_counter() - start)
+                engine.take_output()
+        results[group] = summarize(samples)
+    return results
+
+def compare(results, baseline, threshold):
+    """Return [(group, old_p50, new_p50, ratio)] for groups whose p50 grew by more than threshold"""
+    regressions = []
+    for group, stats in results.items():
+        old = baseline.get('results', {}).get(group)
+        if not old or not old['p50_ms']:
+            continue
+        ratio = stats['p50_ms'] / old['p50_ms']
+        if ratio > threshold:
+            regressions.append((group, old['p50_ms'], stats['p50_ms'], ratio))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Math Terminal command latency and throughput")
+    parser.add_argument('--size', type=int, default=40, help="inputs generated per group")
+    parser.add_argument('--repeat', type=int, default=3, help="times each input is run")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the generated corpus")
+    parser.add_argument('--warm-cache', action='store_true', help="keep the result cache between runs")
+    parser.add_argument('--output', metavar='FILE', help="save the results as JSON")
+    parser.add_argument('--compare', metavar='FILE', help="compare against results saved earlier")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="p50 slowdown ratio counted as a regression (default 1.25)")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.seed, args.size)
+    print(f"Benchmarking {sum(len(c) for c in corpus.values())} inputs x {args.repeat} runs ...")
+    results = run_benchmark(corpus, args.repeat, args.warm_cache)
+
+    print(f"\n{'group':<24}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'ops/s':>10}")
+    for group, stats in results.items():
+        print(f"{group:<24}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+              f"{stats['max_ms']:>10.3f}{stats['ops_per_sec']:>10.1f}")
+
+    if args.output:
+        import sympy
+        report = {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'sympy': sympy.__version__,
+            'platform': platform.platform(),
+            'settings': {'size': args.size, 'repeat': args.repeat, 'seed': args.seed, 'warm_cache': args.warm_cache},
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} group(s) slower than {args.compare} by more than {args.threshold:g}x:")
+            for group, old, new, ratio in regressions:
+                print(f"   {group}: p50 {old:.3f} ms -> {new:.3f} ms ({ratio:.2f}x)")
+            sys.exit(1)
+        print(f"\n✔ No regressions compared to {args.compare}")
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,467 @@
 import os
-import subprocess
+import re
+import ast
 import sys
+import json
+import time
+import shlex
+import shutil
+import pkgutil
+import hashlib
+import argparse
+import subprocess
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+BUILD_DIR = "build"
+DIST_DIR = "dist"
+CACHE_FILE = os.path.join(BUILD_DIR, "compile-cache.json")
+
+# Build profiles: the PyInstaller options each one adds
+PROFILES = {
+    "onefile": ["--onefile"],     # a single .exe, unpacked to a temp dir on every launch
+    "fast-start": ["--onedir"],   # a folder holding the exe and its files: nothing to unpack, and unused modules pruned
+}
+
+# Arguments used for this repo's programs when none are given on the command line. The smoke run
+# should touch every feature (fast-start only keeps what it imports); the launch run starts the
+# program and exits straight away, for timing cold starts with --measure.
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SMOKE = {
+    "Math Terminal": ["--batch", os.path.join(HERE, "smoke_commands.txt")],
+    "Snakes": ["--autopilot", "--fast", "--quit-after", "600"],
+}
+DEFAULT_LAUNCH = {
+    "Math Terminal": ["--batch", "-"],
+    "Snakes": ["--quit-after", "1"],
+}
+# Times fast-start puts back modules a pruned run turned out to need, before giving up on pruning
+MAX_PRUNE_ROUNDS = 5
+MISSING_MODULE_RE = re.compile(r"No module named '([\w.]+)'")
+
+# Runs a script with some modules made unimportable, as if PyInstaller had left them out:
+# python -c PRUNED_RUN "module,module" script args...
+PRUNED_RUN = """
+import os, sys, runpy
+blocked = tuple(name for name in sys.argv[1].split(",") if name)
+class Pruned:
+    def find_spec(self, name, path=None, target=None):
+        if name in blocked or name.startswith(tuple(module + "." for module in blocked)):
+            raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+        return None
+sys.meta_path.insert(0, Pruned())
+sys.argv = sys.argv[2:]
+sys.path.insert(0, os.path.dirname(os.path.abspath(sys.argv[0])))
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+def local_modules(script, seen=None):
+    """The script plus every module it imports from its own folder, recursively"""
+    seen = set() if seen is None else seen
+    script = os.path.abspath(script)
+    if script in seen or not os.path.isfile(script):
+        return seen
+    seen.add(script)
+    folder = os.path.dirname(script)
+    with open(script, "rb") as f:
+        tree = ast.parse(f.read(), script)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            local_modules(os.path.join(folder, name.split(".")[0] + ".py"), seen)
+    return seen
+
+def spec_inputs(spec_file):
+    """Scripts and data files listed in a .spec file's Analysis(...) call"""
+    folder = os.path.dirname(os.path.abspath(spec_file))
+    with open(spec_file, "rb") as f:
+        tree = ast.parse(f.read(), spec_file)
+    scripts, datas = [], []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "Analysis":
+            if node.args:
+                scripts += ast.literal_eval(node.args[0])
+            for keyword in node.keywords:
+                if keyword.arg == "datas":
+                    datas += [source for source, _ in ast.literal_eval(keyword.value)]
+    return [os.path.join(folder, path) for path in scripts], [os.path.join(folder, path) for path in datas]
+
+def target_inputs(target):
+    """Every file whose content goes into the target's build"""
+    if target.endswith(".spec"):
+        scripts, datas = spec_inputs(target)
+        files = {os.path.abspath(target)} | {os.path.abspath(path) for path in datas}
+    else:
+        scripts, files = [target], set()
+    for script in scripts:
+        files |= local_modules(script)
+    return sorted(files)
+
+def content_hash(files, options):
+    """SHA-256 over the build options and each input file's path and bytes"""
+    digest = hashlib.sha256(json.dumps(options).encode())
+    for path in files:
+        digest.update(os.path.relpath(path).encode())
+        try:
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        except OSError:
+            digest.update(b"missing")
+    return digest.hexdigest()
+
+def target_name(target):
+    return os.path.splitext(os.path.basename(target))[0]
 
-def compile_to_exe(source_file):
-    if not os.path.isfile(source_file):
-        print("Error: File not found!")
-        return
-    
-    print(f"Compiling {source_file} to .exe ...")
-    
-    # PyInstaller command with --noconsole to hide the black window
-    command = [
-        "pyinstaller",
-        "--onefile",      # creates a single .exe file
+def work_dir(target, profile):
+    return os.path.join(BUILD_DIR, profile, target_name(target))
+
+def dist_dir(profile):
+    return DIST_DIR if profile == "onefile" else os.path.join(DIST_DIR, profile)
+
+def build_command(target, profile="onefile", clean=False, optimize=0, excludes=()):
+    """PyInstaller command line for a script or spec file, built in its own work dir"""
+    folder = work_dir(target, profile)
+    command = ["pyinstaller", "--noconfirm", "--workpath", folder, "--distpath", dist_dir(profile)]
+    if clean:
+        command.append("--clean")  # clean PyInstaller cache before building
+    if target.endswith(".spec") and profile == "onefile":
+        return command + [target]  # the spec file already says how to build it
+    if target.endswith(".spec"):
+        # Other profiles rebuild from the spec's script, carrying its data files over
+        scripts, datas = spec_inputs(target)
+        for path in datas:
+            command += ["--add-data", f"{path}{os.pathsep}."]
+        target = scripts[0]
+    command += PROFILES[profile] + [
         "--noconsole",    # hides the console window (GUI apps only)
-        "--clean",        # clean PyInstaller cache before building
-        source_file
+        "--specpath", folder,
     ]
-    
+    if optimize:
+        command += ["--optimize", str(optimize)]  # strip asserts (1) and docstrings (2) from the bytecode
+    for module in excludes:
+        command += ["--exclude-module", module]
+    return command + [target]
+
+def executable(target, profile):
+    """Path of the built program, or None if it isn't there"""
+    name = target_name(target)
+    folder = dist_dir(profile) if profile == "onefile" else os.path.join(dist_dir(profile), name)
+    for ext in ("", ".exe", ".app"):
+        path = os.path.join(folder, name + ext)
+        if os.path.isfile(path) or ext == ".app" and os.path.isdir(path):
+            return path
+    return None
+
+def bundle_size(target, profile):
+    """Bytes on disk of everything that ships for this target and profile"""
+    path = executable(target, profile)
+    if path is None:
+        return 0
+    root = path if profile == "onefile" else os.path.dirname(path)
+    if os.path.isfile(root):
+        return os.path.getsize(root)
+    return sum(os.path.getsize(os.path.join(folder, name)) for folder, _, names in os.walk(root) for name in names)
+
+def import_trace(script, args, timeout):
+    """Run the script under -X importtime; returns {module: cumulative microseconds}.
+    The run is cut off after timeout seconds, keeping whatever was imported by then."""
+    command = [sys.executable, "-X", "importtime", os.path.abspath(script)] + args
+    try:
+        result = subprocess.run(command, cwd=os.path.dirname(os.path.abspath(script)), stdin=subprocess.DEVNULL,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout)
+        trace = result.stderr
+    except subprocess.TimeoutExpired as e:
+        trace = e.stderr or b""
+    modules = {}
+    for line in trace.decode(errors="replace").splitlines():
+        fields = line.split("|")
+        if line.startswith("import time:") and len(fields) == 3 and fields[1].strip().isdigit():
+            modules[fields[2].strip()] = int(fields[1])
+    return modules
+
+def unused_submodules(package, imported, depth=2):
+    """Public submodules of an installed package that never showed up in the import trace
+    (private ones are often imported lazily from compiled code, so they stay)"""
+    spec = importlib.util.find_spec(package)
+    if spec is None or not spec.submodule_search_locations:
+        return []
+    unused = []
+    for info in pkgutil.iter_modules(spec.submodule_search_locations, package + "."):
+        if info.name.rpartition(".")[2].startswith("_"):
+            continue
+        if info.name not in imported:
+            unused.append(info.name)
+        elif info.ispkg and depth > 1:
+            unused += unused_submodules(info.name, imported, depth - 1)
+    return unused
+
+def prune_list(script, args, timeout, packages=None):
+    """Modules to exclude: the unused parts of the third-party packages a smoke run imports"""
+    imported = import_trace(script, args, timeout)
+    if packages is None:
+        local = {target_name(path) for path in local_modules(script)}
+        packages = sorted({name.split(".")[0] for name in imported} - set(sys.stdlib_module_names) - local)
+        packages = [name for name in packages if not name.startswith("_")]
+    excludes = []
+    for package in packages:
+        excludes += unused_submodules(package, imported)
+    return imported, excludes
+
+def blocked_modules(output, excludes):
+    """The excluded modules that output shows an import failing for"""
+    missing = MISSING_MODULE_RE.findall(output)
+    return sorted({module for module in excludes for name in missing
+                   if name == module or name.startswith(module + ".")})
+
+def run_output(command, cwd, timeout):
+    """Run a command; returns (exit code, or None if it was stopped after timeout, its stdout and stderr)"""
+    try:
+        result = subprocess.run(command, cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, timeout=timeout)
+        return result.returncode, result.stdout.decode(errors="replace")
+    except subprocess.TimeoutExpired as e:
+        return None, (e.stdout or b"").decode(errors="replace")
+
+def check_excludes(script, args, timeout, excludes, log):
+    """Re-run the smoke run with the excluded modules blocked, putting back any it fails to import"""
+    for _ in range(MAX_PRUNE_ROUNDS):
+        command = [sys.executable, "-c", PRUNED_RUN, ",".join(excludes), os.path.abspath(script)] + args
+        _, output = run_output(command, os.path.dirname(os.path.abspath(script)), timeout)
+        missing = blocked_modules(output, excludes)
+        if not missing:
+            return excludes
+        log.write(f"The smoke run needs {', '.join(missing)} once pruned; keeping them\n")
+        excludes = [module for module in excludes if module not in missing]
+    log.write("Pruning still broke the smoke run after several rounds; nothing is pruned\n")
+    return []
+
+def smoke_bundle(target, profile, args, timeout):
+    """Run the built program with the smoke arguments; returns (exit code or None on timeout, output)"""
+    path = os.path.abspath(executable(target, profile))
+    return run_output([path] + args, os.path.dirname(path), timeout)
+
+def cold_start(target, profile, args, timeout):
+    """Seconds from launching the built program until it exits, or None if it's still running after timeout"""
+    path = executable(target, profile)
+    if path is None:
+        return None
+    path = os.path.abspath(path)
+    start = time.perf_counter()
+    try:
+        subprocess.run([path] + args, cwd=os.path.dirname(path), stdin=subprocess.DEVNULL,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return None
+    return time.perf_counter() - start
+
+def load_cache():
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    with open(CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+
+def build_script(target):
+    return spec_inputs(target)[0][0] if target.endswith(".spec") else target
+
+def write_excludes(folder, excludes):
+    with open(os.path.join(folder, "excludes.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(excludes) + "\n")
+
+def plan_excludes(target, args, options, folder, log):
+    """Modules a fast-start build leaves out: those a traced smoke run never imported, minus any the
+    same run turns out to need once they are blocked"""
+    script = build_script(target)
+    imported, excludes = prune_list(script, args, options.smoke_timeout, options.prune)
+    with open(os.path.join(folder, "importtime.txt"), "w", encoding="utf-8") as f:
+        for module, microseconds in sorted(imported.items(), key=lambda item: -item[1]):
+            f.write(f"{microseconds:>10} us  {module}\n")
+    excludes = check_excludes(script, args, options.smoke_timeout, excludes, log)
+    write_excludes(folder, excludes)
+    return excludes
+
+def run_pyinstaller(target, profile, options, excludes, log, clean=False):
+    if excludes:
+        log.write(f"Excluding {len(excludes)} modules the smoke run never imported (see excludes.txt)\n")
+    log.flush()
+    command = build_command(target, profile, clean, options.optimize, excludes)
     try:
-        subprocess.run(command, check=True)
+        return subprocess.run(command, stdout=log, stderr=subprocess.STDOUT).returncode == 0
+    except OSError as e:
+        log.write(f"Couldn't start PyInstaller: {e}\n")
+        return False
+
+def build_target(target, profile, options, clean=False):
+    """Run one PyInstaller build, logging to its work dir; returns (ok, seconds, log_path).
+    fast-start builds first trace a smoke run of the script to find the modules to leave out, then run
+    the built program the same way and rebuild with any module it can't import put back."""
+    folder = work_dir(target, profile)
+    os.makedirs(folder, exist_ok=True)
+    log_path = os.path.join(folder, "build.log")
+    start = time.perf_counter()
+    args = smoke_args(target, options)
+    with open(log_path, "w", encoding="utf-8") as log:
+        excludes = []
+        if profile == "fast-start":
+            if args:
+                excludes = plan_excludes(target, args, options, folder, log)
+            else:
+                log.write("No smoke run for this target (see --smoke), so no modules are pruned\n")
+                write_excludes(folder, excludes)
+        ok = run_pyinstaller(target, profile, options, excludes, log, clean)
+        for _ in range(MAX_PRUNE_ROUNDS):
+            if not (ok and excludes):
+                break
+            status, output = smoke_bundle(target, profile, args, options.smoke_timeout)
+            missing = blocked_modules(output, excludes)
+            if not missing:
+                if status is None:
+                    log.write(f"The built program's smoke run was stopped after {options.smoke_timeout:g}s; "
+                              f"pruning was only checked up to there\n")
+                elif status != 0:
+                    log.write(f"The built program's smoke run failed with exit code {status}:\n{output}\n")
+                    ok = False
+                break
+            log.write(f"The built program can't import {', '.join(missing)}; building again with them kept\n")
+            excludes = [module for module in excludes if module not in missing]
+            write_excludes(folder, excludes)
+            ok = run_pyinstaller(target, profile, options, excludes, log)
+        else:
+            if ok:
+                log.write("The built program still lacked modules after several rounds; building without pruning\n")
+                write_excludes(folder, [])
+                ok = run_pyinstaller(target, profile, options, [], log)
+    return ok, time.perf_counter() - start, log_path
+
+def smoke_args(target, options):
+    return options.smoke.get(os.path.abspath(target), DEFAULT_SMOKE.get(target_name(build_script(target)), []))
+
+def smoke_inputs(target, options):
+    """Files the smoke run reads (e.g. the --batch command file), which decide the excludes as much as the code"""
+    return {os.path.abspath(arg) for arg in smoke_args(target, options) if arg != "-" and os.path.isfile(arg)}
+
+def launch_args(target, options):
+    return options.launch.get(os.path.abspath(target), DEFAULT_LAUNCH.get(target_name(build_script(target)), []))
+
+def format_size(size):
+    return f"{size / 1024 / 1024:.1f} MB" if size else "-"
+
+def compile_targets(targets, options):
+    """Build every target in every profile in parallel, skipping builds unchanged since they last succeeded"""
+    missing = [target for target in targets if not os.path.isfile(target)]
+    if missing:
+        print(f"Error: File not found: {', '.join(missing)}")
+        return False
+    names = [target_name(target) for target in targets]
+    if len(set(names)) != len(names):
+        print("Error: Two targets share a name, so their builds would overwrite each other.")
+        return False
+
+    cache = load_cache()
+    hashes = {}
+    pending = []
+    for target in targets:
+        for profile in options.profiles:
+            # The smoke run decides what fast-start leaves out, so its arguments and files count as inputs too
+            settings = build_command(target, profile, optimize=options.optimize) + smoke_args(target, options)
+            inputs = sorted(set(target_inputs(target)) | smoke_inputs(target, options))
+            hashes[target, profile] = content_hash(inputs, settings)
+            key = f"{os.path.abspath(target)}|{profile}"
+            if not options.force and cache.get(key) == hashes[target, profile] and executable(target, profile):
+                print(f"✔ {target} ({profile}) is unchanged, skipping.")
+            else:
+                pending.append((target, profile))
+
+    results = {}
+    if pending:
+        print(f"Compiling {', '.join(f'{target} ({profile})' for target, profile in pending)} ...")
+        rest = pending
+        if options.clean:
+            # PyInstaller's --clean also empties its shared cache, which builds running alongside would be
+            # reading from. So each work dir is wiped here, and only the first build cleans the cache,
+            # on its own, before the rest start.
+            for target, profile in pending:
+                shutil.rmtree(work_dir(target, profile), ignore_errors=True)
+            results[pending[0]] = build_target(*pending[0], options, clean=True)
+            rest = pending[1:]
+        with ThreadPoolExecutor(max_workers=options.jobs or max(1, len(rest))) as pool:
+            for job, result in zip(rest, pool.map(lambda job: build_target(*job, options), rest)):
+                results[job] = result
+        for job, (ok, _, _) in results.items():
+            if ok:
+                cache[f"{os.path.abspath(job[0])}|{job[1]}"] = hashes[job]
+        save_cache(cache)
+
+    width = max(len(target) for target in targets) + 4
+    print(f"\n{'target':<{width}}{'profile':<12}{'result':<10}{'time':>8}{'size':>11}{'cold start':>12}")
+    for target in targets:
+        for profile in options.profiles:
+            # Cold starts are timed one at a time, after the builds, so they don't compete for the CPU
+            launch = cold_start(target, profile, launch_args(target, options), options.smoke_timeout) if options.measure else None
+            launch_text = f"{launch:.2f}s" if launch is not None else ("timeout" if options.measure else "-")
+            size_text = format_size(bundle_size(target, profile))
+            if (target, profile) not in results:
+                print(f"{target:<{width}}{profile:<12}{'skipped':<10}{'-':>8}{size_text:>11}{launch_text:>12}")
+                continue
+            ok, seconds, log_path = results[target, profile]
+            print(f"{target:<{width}}{profile:<12}{'built' if ok else 'FAILED':<10}{seconds:>7.1f}s"
+                  f"{size_text:>11}{launch_text:>12}")
+            if not ok:
+                print(f"   see {log_path}")
+
+    if not results:
+        print("\n✔ Everything is up to date.")
+        return True
+    if all(ok for ok, _, _ in results.values()):
         print("\n✔ Compilation successful!")
-        print("Your EXE is located inside the 'dist' folder.")
+        print(f"Your EXEs are located inside the '{DIST_DIR}' folder.")
         print("The annoying black console window is now GONE! 🎉")
-    except subprocess.CalledProcessError:
-        print("\n❌ Compilation failed. Check for errors in your script.")
-    except Exception as e:
-        print(f"Unexpected error: {e}")
+        return True
+    print("\n❌ Compilation failed. Check for errors in your script.")
+    return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile Python scripts or PyInstaller .spec files to executables")
+    parser.add_argument("targets", nargs="+", metavar="TARGET", help="a .py script or .spec file")
+    parser.add_argument("--profile", dest="profiles", action="append", choices=list(PROFILES),
+                        help="build profile, can be given more than once (default: onefile)")
+    parser.add_argument("--jobs", type=int, help="builds run at the same time (default: all of them)")
+    parser.add_argument("--clean", action="store_true",
+                        help="clear PyInstaller's cache and the work dirs before building (the first build runs alone)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if nothing changed")
+    parser.add_argument("--optimize", type=int, choices=[0, 1, 2], default=0,
+                        help="bytecode optimization level for builds made from a script (PyInstaller 6+)")
+    parser.add_argument("--smoke", action="append", default=[], metavar="TARGET=ARGS",
+                        help="arguments for the smoke run of TARGET: ones that use every feature and then exit "
+                             "(e.g. \"Math Terminal.py=--batch smoke_commands.txt\", the default for it)")
+    parser.add_argument("--launch", action="append", default=[], metavar="TARGET=ARGS",
+                        help="arguments that make TARGET start and exit right away, for --measure")
+    parser.add_argument("--smoke-timeout", type=float, default=15,
+                        help="seconds a smoke run or cold start may take before it is stopped")
+    parser.add_argument("--prune", action="append", metavar="PACKAGE",
+                        help="package whose unused submodules fast-start leaves out (default: every third-party one imported)")
+    parser.add_argument("--measure", action="store_true",
+                        help="time a cold start of every built program, run with its launch arguments")
+    options = parser.parse_args()
+    options.profiles = options.profiles or ["onefile"]
+    for name in ("smoke", "launch"):
+        per_target = {}
+        for item in getattr(options, name):
+            target, _, args = item.partition("=")
+            per_target[os.path.abspath(target)] = shlex.split(args)
+        setattr(options, name, per_target)
+    if not compile_targets(options.targets, options):
+        sys.exit(1)
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python compile.py <your_script.py>")
-    else:
-        compile_to_exe(sys.argv[1])
+    main()